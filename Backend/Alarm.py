@@ -5,15 +5,8 @@ import pygame
 import os
 from Backend.TextToSpeech import TextToSpeech
 
-# Initialize pygame at module level
-try:
-    pygame.init()
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-    print("[INFO] Pygame mixer initialized successfully")
-except Exception as e:
-    print(f"[ERROR] Failed to initialize pygame mixer: {e}")
-
 alarms = []
+alarm_thread = None
 
 def parse_alarm_time(text):
     import re
@@ -97,13 +90,6 @@ def parse_alarm_time(text):
     print("[DEBUG] Could not parse any time format from the text.")
     return None
 
-# Initialize pygame mixer
-try:
-    pygame.init()
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-    print("[INFO] Pygame mixer initialized successfully")
-except Exception as e:
-    print(f"[ERROR] Failed to initialize pygame mixer: {e}")
 
 def alarm_checker():
     # Define the alarm sound path
@@ -148,11 +134,19 @@ def alarm_checker():
                 
         time.sleep(5)  # Check every 5 seconds
 
+# Start the alarm checker in a separate thread the first time an alarm is set
+def StartAlarmChecker():
+    global alarm_thread
+    if alarm_thread is None:
+        alarm_thread = threading.Thread(target=alarm_checker, daemon=True)
+        alarm_thread.start()
+
 def SetAlarm(text):
     try:
         alarm_time = parse_alarm_time(text)
         if alarm_time:
             alarms.append(alarm_time)
+            StartAlarmChecker()
             print(f"[DEBUG] Alarm set for: {alarm_time}")
             print(f"Alarm set for {alarm_time.strftime('%I:%M %p')}, sir.")
             return True
@@ -165,6 +159,3 @@ def SetAlarm(text):
         print("Sorry sir, there was an error setting the alarm.")
         return False
 
-# Start the alarm checker in a separate thread
-alarm_thread = threading.Thread(target=alarm_checker, daemon=True)
-alarm_thread.start()
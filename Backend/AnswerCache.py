@@ -0,0 +1,171 @@
+import re
+import threading  # Lookups and inserts come from several intent threads.
+import time  # Entry age and hit timestamps.
+import zlib  # Stable shingle hashes across runs.
+from collections import OrderedDict  # LRU order of cached answers.
+from dotenv import dotenv_values  # Cache settings come from .env.
+
+env_vars = dotenv_values(".env")
+
+# Near-duplicate general questions ("what is python" / "what's python programming language?")
+# reuse an earlier answer. Questions are compared by their content words: candidates are found
+# through LSH buckets of MinHash signatures over those words, so a lookup is a few dictionary
+# hits, and a candidate is used when the weighted Jaccard similarity of the two word sets reaches
+# the threshold, so "capital of india" never answers "capital of indiana".
+
+AnswerCacheEnabled = str(env_vars.get("AnswerCache", "True")).lower() != "false"
+AnswerCacheSize = int(env_vars.get("AnswerCacheSize", 500))
+AnswerCacheThreshold = float(env_vars.get("AnswerCacheThreshold", 0.8))
+AnswerCacheTTL = float(env_vars.get("AnswerCacheTTL", 24 * 3600))
+
+Prime = (1 << 61) - 1
+Bands = 16
+Rows = 4
+Permutations = [((i * 0x9E3779B1 + 0x7F4A7C15) % Prime | 1, (i * 0x85EBCA77 + 0xC2B2AE3D) % Prime) for i in range(1, Bands * Rows + 1)]
+
+Contractions = {"what's": "what is", "who's": "who is", "how's": "how is", "where's": "where is", "it's": "it is",
+                "whats": "what is", "whos": "who is", "can't": "cannot", "don't": "do not", "i'm": "i am"}
+
+# Answers to these change with time, depend on what was said before, or hinge on a number
+# ("square root of 144"), so they are never reused.
+Volatile = re.compile(
+    r"\d|"
+    r"\b(?:time|date|day|today|tonight|tomorrow|yesterday|now|current|currently|latest|recent|news|weather|"
+    r"this (?:week|month|year)|he|she|him|her|his|hers|it|its|they|them|their|this|that|these|those|"
+    r"again|more|previous|last|above|continue|my|mine)\b"
+)
+Filler = {"a", "an", "the", "please", "tell", "me", "about", "can", "you", "could", "would", "kindly", "jarvis"}
+# Words that do not change what is being asked; question words, tense and prepositions do.
+Stopwords = Filler | {"is", "are", "of", "do", "does"}
+# Qualifiers that rarely change the answer ("python programming language"); each counts as a
+# quarter of a word, and they are left out of the signature.
+Generic = {"programming", "language", "exactly", "actually", "really", "briefly", "basically", "simply", "short"}
+GenericWeight = 0.25
+
+
+def Normalize(query):
+    text = query.lower().replace("’", "'")
+    words = [Contractions.get(word, word) for word in re.findall(r"[\w']+", text)]
+    return " ".join(" ".join(words).split())
+
+
+def ContentWords(text):
+    """The words that decide the answer: the question without filler and stopwords."""
+    return frozenset(word for word in text.split() if word not in Stopwords) or frozenset(text.split())
+
+
+def Weight(words):
+    return sum(GenericWeight if word in Generic else 1.0 for word in words)
+
+
+def Similarity(first, second):
+    """Weighted Jaccard similarity of two content word sets."""
+    union = first | second
+    return Weight(first & second) / Weight(union) if union else 1.0
+
+
+def Signature(content):
+    """MinHash signature of the content words, generic qualifiers left out."""
+    words = (content - Generic) or content
+    hashes = [zlib.crc32(word.encode("utf-8")) for word in words]
+    return tuple(min((a * h + b) % Prime for h in hashes) for a, b in Permutations)
+
+
+class AnswerCache:
+    """Bounded LRU of general answers looked up by the similarity of the question's content words."""
+
+    def __init__(self, capacity=AnswerCacheSize, threshold=AnswerCacheThreshold, ttl=AnswerCacheTTL):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self.entries = OrderedDict()  # normalized query -> entry dict
+        self.buckets = {}  # (band, band hash) -> set of normalized queries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def cacheable(self, text):
+        return bool(text) and not Volatile.search(text)
+
+    def bands(self, signature):
+        return [(band, signature[band * Rows:(band + 1) * Rows]) for band in range(Bands)]
+
+    def get(self, query):
+        """The cached answer for a similar enough question, or None."""
+        text = Normalize(query)
+        if not self.cacheable(text):
+            with self.lock:
+                self.bypassed += 1
+            return None
+        content = ContentWords(text)
+        signature = Signature(content)
+        now = time.time()
+        with self.lock:
+            candidates = set()
+            for key in self.bands(signature):
+                candidates |= self.buckets.get(key, set())
+            best, score = None, 0.0
+            for candidate in candidates:
+                entry = self.entries[candidate]
+                if now - entry["created"] >= self.ttl:
+                    continue
+                similarity = Similarity(content, entry["content"])
+                if similarity > score:
+                    best, score = candidate, similarity
+            if best is None or score < self.threshold:
+                self.misses += 1
+                return None
+            entry = self.entries[best]
+            entry["hits"] += 1
+            entry["last_hit"] = now
+            self.entries.move_to_end(best)
+            self.hits += 1
+            return entry["answer"]
+
+    def put(self, query, answer):
+        text = Normalize(query)
+        if not self.cacheable(text) or not answer or self.capacity <= 0:
+            return
+        content = ContentWords(text)
+        signature = Signature(content)
+        with self.lock:
+            if text in self.entries:
+                self.remove(text)
+            self.entries[text] = {"query": query, "answer": answer, "signature": signature, "content": content,
+                                  "created": time.time(), "hits": 0, "last_hit": None}
+            for key in self.bands(signature):
+                self.buckets.setdefault(key, set()).add(text)
+            while len(self.entries) > self.capacity:
+                self.remove(next(iter(self.entries)))
+
+    def remove(self, text):
+        # Called with the lock held.
+        entry = self.entries.pop(text)
+        for key in self.bands(entry["signature"]):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(text)
+                if not bucket:
+                    del self.buckets[key]
+
+    def stats(self, top=10):
+        """Totals plus the most reused entries with their hit counts."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            entries = sorted(self.entries.values(), key=lambda entry: entry["hits"], reverse=True)[:top]
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "top": [{"query": entry["query"], "hits": entry["hits"], "last_hit": entry["last_hit"]} for entry in entries],
+            }
+
+
+answer_cache = AnswerCache()
+
+
+def AnswerCacheStats():
+    return answer_cache.stats()
@@ -9,9 +9,12 @@ except ImportError:
     InternetException = None
     print("[WARNING] pywhatkit not available. Some features may not work without internet connection.")
 from dotenv import dotenv_values               # Import dotenv to manage environment variables.
+from Backend.Tracing import Traced  # Per-stage latency spans.
+from Backend.ConversationBuffer import ConversationBuffer  # Bounded message history.
 from bs4 import BeautifulSoup                  # Import BeautifulSoup for parsing HTML content.
 from rich import print                         # Import rich for styled console output.
-from groq import Groq                          # Import Groq for AI chat functionalities.
+from Backend.Providers import GetGroq  # Shared pooled Groq client.
+from Backend.Resilience import Call, DegradedAnswer  # Retries, backoff and the provider circuit breaker.
 import webbrowser                              # Import webbrowser for opening URLs.
 import subprocess                              # Import subprocess for interacting with the system.
 import requests                                # Import requests for making HTTP requests.
@@ -34,7 +37,14 @@ classes = [
 
 # Define a user-agent for making web requests.
 useragent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36'
-client = Groq(api_key=GroqAPIKey)
+# The shared Groq client is fetched on first use so importing this module stays cheap.
+client = None
+
+def GetClient():
+    global client
+    if client is None:
+        client = GetGroq()
+    return client
 
 # Predefined professional responses for user interactions.
 professional_responses = [
@@ -42,8 +52,8 @@ professional_responses = [
     "I'm at your service for any additional questions or support you may need—don't hesitate to ask."
 ]
 
-# List to store chatbot messages.
-messages = []
+# Recent content-writer messages; the oldest are dropped to keep each Groq request within budget.
+messages = ConversationBuffer("Automation.messages")
 
 # System message to provide context to the chatbot.
 SystemChatBot = [{
@@ -66,31 +76,37 @@ def Content(Topic):
 
     # Nested function to generate content using the AI chatbot.
     def ContentWriterAI(prompt):
-        messages.append({"role": "user", "content": f"{prompt}"})  # Add the user's prompt to messages.
-
-        completion = client.chat.completions.create(
-           model="llama3-8b-8192",  # Specify the AI model.
-            messages=SystemChatBot + messages,  # Include system instructions and chat history.
-            max_tokens=2048,  # Limit the maximum tokens in the response.
-            temperature=0.7,  # Adjust response randomness.
-            top_p=1,  # Use nucleus sampling for response diversity.
-            stream=True,  # Enable streaming response.
-            stop=None  # Allow the model to determine stopping conditions.
-        )
-
-        Answer = ""  # Initialize an empty string for the response.
-
-        # Process streamed response chunks.
-        for chunk in completion:
-            if chunk.choices[0].delta.content:  # Check for content in the current chunk.
-                Answer += chunk.choices[0].delta.content  # Append the content to the answer.
-
-        Answer = Answer.replace("</s>", "")  # Remove unwanted tokens from the response.
-        messages.append({"role": "assistant", "content": Answer})  # Add the AI's response to messages.
+        request = {"role": "user", "content": f"{prompt}"}
+
+        def Generate():
+            completion = GetClient().chat.completions.create(
+               model="llama3-8b-8192",  # Specify the AI model.
+                messages=SystemChatBot + list(messages) + [request],  # Include system instructions and chat history.
+                max_tokens=2048,  # Limit the maximum tokens in the response.
+                temperature=0.7,  # Adjust response randomness.
+                top_p=1,  # Use nucleus sampling for response diversity.
+                stream=True,  # Enable streaming response.
+                stop=None  # Allow the model to determine stopping conditions.
+            )
+
+            Answer = ""  # Initialize an empty string for the response.
+
+            # Process streamed response chunks.
+            for chunk in completion:
+                if chunk.choices[0].delta.content:  # Check for content in the current chunk.
+                    Answer += chunk.choices[0].delta.content  # Append the content to the answer.
+            return Answer
+
+        Answer = Call("groq", Generate).replace("</s>", "")  # Remove unwanted tokens from the response.
+        messages.extend([request, {"role": "assistant", "content": Answer}])  # Keep the exchange only once it succeeded.
         return Answer
 
     Topic = Topic.replace("Content", "")  # Remove "Content" from the topic.
-    ContentByAI = ContentWriterAI(Topic)  # Generate content using AI.
+    try:
+        ContentByAI = ContentWriterAI(Topic)  # Generate content using AI.
+    except Exception as e:
+        print(f"Content generation failed: {e}")
+        return DegradedAnswer("groq")  # Spoken by the caller in place of opening the file.
 
     # Save the generated content to a text file.
     with open(rf"Data\{Topic.lower().replace(' ', '')}.txt", "w", encoding="utf-8") as file:
@@ -312,8 +328,11 @@ async def TranslateAndExecute(commands: list[str]):
              yield result
 
 # Asynchronous function to automate command execution.
+@Traced("Automation")
 async def Automation(commands: list[str]):
+    Messages = []
     async for result in TranslateAndExecute(commands):  # Translate and execute commands.
-        pass
-    return True  # Indicate success.
+        if isinstance(result, str):
+            Messages.append(result)  # Something to tell the user, such as a degraded-mode notice.
+    return "\n".join(Messages) if Messages else True  # Indicate success.
 
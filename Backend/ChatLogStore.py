@@ -0,0 +1,192 @@
+import atexit  # Pending lines are flushed on a normal exit.
+import json  # One JSON object per line.
+import os  # Atomic appends and replaces.
+import threading  # Appends come from several intent threads at once.
+import time  # Batching window of the writer thread.
+from dotenv import dotenv_values  # Tail size is configured in .env.
+
+env_vars = dotenv_values(".env")
+
+# Messages kept in memory and sent back to the models as history.
+ChatLogTail = int(env_vars.get("ChatLogTail", 200))
+# How long the writer waits for more messages before writing a batch.
+ChatLogFlushMs = float(env_vars.get("ChatLogFlushMs", 200))
+
+
+def ReadTail(path, count, block=64 * 1024):
+    """Parse the last `count` lines of a JSON lines file, reading backwards from the end."""
+    with open(path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(block, position)
+            position -= step
+            file.seek(position)
+            data = file.read(step) + data
+
+    entries = []
+    for line in data.splitlines()[-count:] if count else []:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue  # A partial line left by a crash mid-append.
+    return entries
+
+
+class ChatLogStore:
+    """The conversation state shared by every backend: recent messages in memory, appended to disk.
+
+    Appends update the in-memory history at once and queue their lines for a single writer
+    thread, which writes whatever has accumulated in one append-mode write. Readers get the
+    current history as an immutable tuple without touching the disk or waiting for the writer.
+    The first use migrates an existing Data/ChatLog.json.
+    """
+
+    def __init__(self, path=rf"Data\ChatLog.jsonl", legacy=rf"Data\ChatLog.json", tail=ChatLogTail, flush_ms=ChatLogFlushMs):
+        self.path = path
+        self.legacy = legacy
+        self.tail = tail
+        self.delay = flush_ms / 1000
+        self.cache = None  # Tuple of the most recent messages, replaced (never mutated) on append.
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.io_lock = threading.Lock()  # Serializes file writes between the writer and clear().
+        self.pending = []  # Encoded lines not yet written.
+        self.writing = False
+        self.writer = None
+        self.counts = {"appends": 0, "writes": 0, "lines": 0, "largest_batch": 0}
+
+    def load(self):
+        # Called with the lock held, on first use.
+        if not os.path.exists(self.path):
+            self.migrate()
+        if os.path.exists(self.path):
+            self.terminate_last_line()
+        self.cache = tuple(ReadTail(self.path, self.tail)) if os.path.exists(self.path) else ()
+
+    def terminate_last_line(self):
+        """End a partial line left by a crash mid-append, so the next append starts on its own line."""
+        try:
+            with open(self.path, "rb+") as file:
+                file.seek(0, os.SEEK_END)
+                if file.tell() == 0:
+                    return
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    file.write(b"\n")
+        except OSError as e:
+            print(f"[WARNING] Could not check the end of the chat log: {e}")
+
+    def migrate(self):
+        """Convert the old whole-file JSON log once; the original is kept as ChatLog.json.bak."""
+        try:
+            with open(self.legacy, "r", encoding='utf-8') as file:
+                entries = json.load(file)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            print(f"[WARNING] {self.legacy} is not valid JSON; starting a new chat log.")
+            return
+
+        self.write_all(entries)
+        os.replace(self.legacy, self.legacy + ".bak")
+        print(f"[INFO] Migrated {len(entries)} chat log messages to {self.path}")
+
+    def write_all(self, entries):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding='utf-8') as file:
+            for entry in entries:
+                file.write(json.dumps(entry) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+
+    def snapshot(self):
+        """The recent messages, oldest first, as a tuple that later appends do not change."""
+        with self.lock:
+            if self.cache is None:
+                self.load()
+            return self.cache
+
+    def messages(self):
+        """A list copy of the recent messages, for callers that add to it."""
+        return list(self.snapshot())
+
+    def append(self, *entries):
+        """Add messages (typically a question and its answer) together; they reach the disk shortly after."""
+        lines = [json.dumps(entry) + "\n" for entry in entries]
+        with self.lock:
+            if self.cache is None:
+                self.load()
+            self.cache = (self.cache + entries)[-self.tail:] if self.tail else ()
+            self.pending.extend(lines)
+            self.counts["appends"] += 1
+            if self.writer is None:
+                self.writer = threading.Thread(target=self.write_loop, name="ChatLogWriter", daemon=True)
+                self.writer.start()
+            self.changed.notify_all()
+
+    def write_loop(self):
+        while True:
+            with self.lock:
+                while not self.pending:
+                    self.changed.wait()
+            time.sleep(self.delay)  # Let the other messages of a burst join this write.
+            with self.io_lock:
+                with self.lock:
+                    lines, self.pending = self.pending, []
+                    self.writing = bool(lines)
+                try:
+                    if lines:
+                        self.write(lines)
+                except OSError as e:
+                    print(f"[WARNING] Could not write the chat log: {e}")
+                finally:
+                    with self.lock:
+                        self.writing = False
+                        if lines:
+                            self.counts["writes"] += 1
+                            self.counts["lines"] += len(lines)
+                            self.counts["largest_batch"] = max(self.counts["largest_batch"], len(lines))
+                        self.changed.notify_all()
+
+    def write(self, lines):
+        # Called by the writer with io_lock held.
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        descriptor = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            os.write(descriptor, "".join(lines).encode("utf-8"))
+        finally:
+            os.close(descriptor)
+
+    def flush(self, timeout=5):
+        """Wait until every appended message is on disk (or the timeout passes)."""
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            while (self.pending or self.writing) and self.writer is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.changed.wait(remaining)
+        return True
+
+    def clear(self):
+        with self.io_lock:
+            with self.lock:
+                self.pending = []
+                self.cache = ()
+            self.write_all([])
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counts)
+            stats["pending"] = len(self.pending)
+            stats["cached"] = len(self.cache or ())
+            return stats
+
+
+# Process-wide conversation state shared by the chatbot, the realtime search engine and the GUI history.
+chat_log = ChatLogStore()
+atexit.register(chat_log.flush)
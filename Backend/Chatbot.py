@@ -1,7 +1,16 @@
-from groq import Groq  # Importing the Groq library to use its API.
-from json import load, dump  # Importing functions to read and write JSON files.
+from Backend.Providers import GetGroq, GetAsyncGroq  # Shared pooled Groq clients.
+from Backend.ChatLogStore import chat_log  # Append-only conversation history.
+from Backend.ContextWindow import context_window  # Token-budgeted history with a rolling summary.
+from Backend.AnswerCache import answer_cache, AnswerCacheEnabled  # Reuse answers to near-duplicate questions.
+from Backend.Resilience import Call, CallAsync, Stream, DegradedAnswer  # Retries, backoff and the provider circuit breaker.
+import asyncio  # Deadlines for the async API.
 import datetime  # Importing the datetime module for real-time date and time information.
+import contextvars  # Keeps the turn ID on the speculative worker thread.
+import queue  # Hands speculative chunks to whoever commits the answer.
+import threading  # Speculative answers are generated on their own thread.
+import time  # Time spent on speculations that were thrown away.
 from dotenv import dotenv_values  # Importing dotenv_values to read environment variables from a .env file.
+from Backend.Tracing import Traced, Span  # Per-stage latency spans.
 
 # Load environment variables from the .env file.
 env_vars = dotenv_values(".env")
@@ -11,11 +20,14 @@ Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
-# Initialize the Groq client using the provided API key.
-client = Groq(api_key=GroqAPIKey)
+# The shared Groq client is fetched on first use so importing this module stays cheap.
+client = None
 
-# Initialize an empty list to store chat messages.
-messages = []
+def GetClient():
+    global client
+    if client is None:
+        client = GetGroq()
+    return client
 
 # Define a system message that provides context to the AI chatbot about its role and behavior.
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which also has real-time up-to-date information from the internet.
@@ -29,15 +41,6 @@ SystemChatBot = [
     {"role": "system", "content": System}
 ]
 
-# Attempt to load the chat log from a JSON file.
-try:
-    with open(rf"Data\ChatLog.json", "r") as f:
-        messages = load(f)  # Load existing messages from the chat log.
-except FileNotFoundError:
-    # If the file doesn't exist, create an empty JSON file to store chat logs.
-    with open(rf"Data\ChatLog.json", "w") as f:
-        dump([], f)
-
 # Function to get real-time date and time information.
 def RealtimeInformation():
     current_date_time = datetime.datetime.now()  # Get the current date and time.
@@ -63,54 +66,281 @@ def AnswerModifier(Answer):
     modified_answer = '\n'.join(non_empty_lines)  # Join the cleaned lines back together.
     return modified_answer
 
+# Return a cached answer to a near-identical earlier question, logged like a fresh answer.
+def CachedAnswer(Query):
+    if not AnswerCacheEnabled:
+        return None
+    Answer = answer_cache.get(Query)
+    if Answer is not None:
+        chat_log.append({"role": "user", "content": f"{Query}"}, {"role": "assistant", "content": Answer})
+    return Answer
+
+def RememberAnswer(Query, Answer):
+    if AnswerCacheEnabled:
+        answer_cache.put(Query, Answer)
+
 # Main chatbot function to handle user queries.
+@Traced("ChatBot")
 def ChatBot(Query):
     """This function sends the user's query to the chatbot and returns the AI's response."""
-    
+
+    Answer = CachedAnswer(Query)
+    if Answer is not None:
+        return AnswerModifier(Answer=Answer)
+
     try:
-        # Load the existing chat log from the JSON file.
-        with open(rf"Data\ChatLog.json", "r") as f:
-            messages = load(f)
+        # Load the recent chat history.
+        messages = chat_log.messages()
 
         # Append the user's query to the messages list.
         messages.append({"role": "user", "content": f"{Query}"})
 
-        # Make a request to the Groq API for a response.
-        completion = client.chat.completions.create(
-            model="llama3-70b-8192",  # Specify the AI model to use.
-            messages=SystemChatBot + [{"role": "system", "content": RealtimeInformation()}] + messages,
-            max_tokens=1024,  # Limit the maximum tokens in the response.
-            temperature=0.7,  # Adjust response randomness (higher means more random).
-            top_p=1,  # Use nucleus sampling to control diversity.
-            stream=True,  # Enable streaming response.
-            stop=None  # Allow the model to determine when to stop.
-        )
-
-        Answer = ""  # Initialize an empty string to store the AI's response.
+        def Generate():
+            # Make a request to the Groq API for a response.
+            completion = GetClient().chat.completions.create(
+                model="llama3-70b-8192",  # Specify the AI model to use.
+                messages=SystemChatBot + [{"role": "system", "content": RealtimeInformation()}] + context_window.fit(messages),
+                max_tokens=1024,  # Limit the maximum tokens in the response.
+                temperature=0.7,  # Adjust response randomness (higher means more random).
+                top_p=1,  # Use nucleus sampling to control diversity.
+                stream=True,  # Enable streaming response.
+                stop=None  # Allow the model to determine when to stop.
+            )
 
-        # Process the streamed response chunks.
-        for chunk in completion:
-            if chunk.choices[0].delta.content:  # Check if there's content in the current chunk.
-                Answer += chunk.choices[0].delta.content  # Append the content to the answer.
+            Answer = ""  # Initialize an empty string to store the AI's response.
 
-        Answer = Answer.replace("</s>", "")  # Clean up any unwanted tokens from the response.
+            # Process the streamed response chunks.
+            for chunk in completion:
+                if chunk.choices[0].delta.content:  # Check if there's content in the current chunk.
+                    Answer += chunk.choices[0].delta.content  # Append the content to the answer.
+            return Answer
 
-        # Append the chatbot's response to the messages list.
-        messages.append({"role": "assistant", "content": Answer})
+        # Transient failures are retried with backoff; a provider outage fails fast.
+        Answer = Call("groq", Generate).replace("</s>", "")  # Clean up any unwanted tokens from the response.
 
-        # Save the updated chat log to the JSON file.
-        with open(rf"Data\ChatLog.json", "w") as f:
-            dump(messages, f, indent=4)
+        # Save the question and the chatbot's response to the chat log.
+        chat_log.append(messages[-1], {"role": "assistant", "content": Answer})
+        RememberAnswer(Query, Answer)
 
         # Return the formatted response.
         return AnswerModifier(Answer=Answer)
 
     except Exception as e:
-        # Handle errors by printing the exception and resetting the chat log.
+        # The chat log is kept; the user hears that the service is unavailable instead.
         print(f"Error: {e}")
-        with open(rf"Data\ChatLog.json", "w") as f:
-            dump([], f, indent=4)
-        return ChatBot(Query)  # Retry the query after resetting the log.
+        return DegradedAnswer("groq")
+
+# Streaming variant of ChatBot that yields the response piece by piece as it is generated.
+@Traced("ChatBot")
+def ChatBotStream(Query):
+    """This function yields the AI's response as it streams in and saves the chat log once complete."""
+
+    Answer = CachedAnswer(Query)
+    if Answer is not None:
+        yield Answer
+        return
+
+    # Load the recent chat history.
+    messages = chat_log.messages()
+
+    # Append the user's query to the messages list.
+    messages.append({"role": "user", "content": f"{Query}"})
+
+    # Make a streaming request to the Groq API; it is retried until the first chunk arrives.
+    completion = Stream("groq", lambda: GetClient().chat.completions.create(
+        model="llama3-70b-8192",
+        messages=SystemChatBot + [{"role": "system", "content": RealtimeInformation()}] + context_window.fit(messages),
+        max_tokens=1024,
+        temperature=0.7,
+        top_p=1,
+        stream=True,
+        stop=None
+    ))
+
+    Answer = ""
+
+    # Yield each piece of content as soon as it arrives.
+    try:
+        for chunk in completion:
+            content = chunk.choices[0].delta.content
+            if content:
+                content = content.replace("</s>", "")
+                Answer += content
+                yield content
+    except Exception as e:
+        # A partial answer has already been shown and is left unsaved.
+        print(f"Error: {e}")
+        if not Answer:
+            yield DegradedAnswer("groq")
+        return
+
+    # Save the question and the chatbot's response to the chat log.
+    chat_log.append(messages[-1], {"role": "assistant", "content": Answer})
+    RememberAnswer(Query, Answer)
+
+# Async counterpart of ChatBot: many can run on one event loop without a thread per request.
+@Traced("ChatBot")
+async def ChatBotAsync(Query, deadline=None):
+    """This function awaits the AI's response; deadline (seconds) bounds the whole call, retries included.
+
+    Cancelling the awaiting task closes the request and leaves the chat log untouched.
+    """
+
+    Answer = CachedAnswer(Query)
+    if Answer is not None:
+        return AnswerModifier(Answer=Answer)
+
+    messages = chat_log.messages()
+    messages.append({"role": "user", "content": f"{Query}"})
+
+    async def Generate():
+        completion = await GetAsyncGroq(timeout=deadline).chat.completions.create(
+            model="llama3-70b-8192",
+            messages=SystemChatBot + [{"role": "system", "content": RealtimeInformation()}] + context_window.fit(messages),
+            max_tokens=1024,
+            temperature=0.7,
+            top_p=1,
+            stream=True,
+            stop=None
+        )
+        Answer = ""
+        try:
+            async for chunk in completion:
+                if chunk.choices[0].delta.content:
+                    Answer += chunk.choices[0].delta.content
+        finally:
+            await completion.close()  # Also runs on cancellation, so the connection goes back to the pool.
+        return Answer
+
+    try:
+        Answer = (await asyncio.wait_for(CallAsync("groq", Generate), deadline)).replace("</s>", "")
+    except Exception as e:
+        # Includes the deadline expiring; the chat log is kept.
+        print(f"Error: {e!r}")
+        return DegradedAnswer("groq")
+
+    chat_log.append(messages[-1], {"role": "assistant", "content": Answer})
+    RememberAnswer(Query, Answer)
+    return AnswerModifier(Answer=Answer)
+
+# Counters for tuning speculative answers: how many were used and how much work was thrown away.
+speculation_lock = threading.Lock()
+speculation_stats = {"started": 0, "committed": 0, "cancelled": 0, "wasted_chars": 0, "wasted_seconds": 0.0}
+
+
+def SpeculationStats():
+    with speculation_lock:
+        stats = dict(speculation_stats)
+    stats["wasted_seconds"] = round(stats["wasted_seconds"], 3)
+    stats["commit_rate"] = round(stats["committed"] / stats["started"], 4) if stats["started"] else None
+    return stats
+
+
+class SpeculativeChat:
+    """A ChatBot answer started before the decision is known.
+
+    The Groq request runs on its own thread while FirstLayerDMM decides. stream() or commit()
+    uses the answer and saves it to the chat log; cancel() closes the request and nothing is saved.
+    """
+
+    def __init__(self, Query):
+        self.Query = Query
+        self.chunks = queue.Queue()
+        self.cancelled = threading.Event()
+        self.completion = None
+        self.messages = None
+        self.error = None
+        self.generated = 0
+        self.cached = False
+        self.started = time.perf_counter()
+        with speculation_lock:
+            speculation_stats["started"] += 1
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(self.run,), daemon=True).start()
+
+    def run(self):
+        try:
+            with Span("ChatBotSpeculative"):
+                Answer = answer_cache.get(self.Query) if AnswerCacheEnabled else None
+                if Answer is not None:
+                    self.cached = True
+                    self.messages = [{"role": "user", "content": f"{self.Query}"}]
+                    self.chunks.put(Answer)
+                    return
+
+                self.messages = chat_log.messages()
+                self.messages.append({"role": "user", "content": f"{self.Query}"})
+
+                def Create():
+                    self.completion = GetClient().chat.completions.create(
+                        model="llama3-70b-8192",
+                        messages=SystemChatBot + [{"role": "system", "content": RealtimeInformation()}] + context_window.fit(self.messages),
+                        max_tokens=1024,
+                        temperature=0.7,
+                        top_p=1,
+                        stream=True,
+                        stop=None
+                    )
+                    return self.completion
+
+                for chunk in Stream("groq", Create):
+                    if self.cancelled.is_set():
+                        break
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        content = content.replace("</s>", "")
+                        self.generated += len(content)
+                        self.chunks.put(content)
+        except Exception as e:
+            if not self.cancelled.is_set():
+                self.error = e
+        finally:
+            if self.cancelled.is_set():
+                self.close()
+            self.chunks.put(None)
+
+    def close(self):
+        close = getattr(self.completion, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def stream(self):
+        """Yield the speculative answer as it arrives and save it to the chat log once complete."""
+        with speculation_lock:
+            speculation_stats["committed"] += 1
+        Answer = ""
+        while True:
+            content = self.chunks.get()
+            if content is None:
+                break
+            Answer += content
+            yield content
+
+        if self.error is not None:
+            print(f"Error: {self.error}")
+            if not Answer:
+                # The request was already retried, so answer in degraded mode.
+                yield DegradedAnswer("groq")
+            return
+
+        chat_log.append(self.messages[-1], {"role": "assistant", "content": Answer})
+        if not self.cached:
+            RememberAnswer(self.Query, Answer)
+
+    def commit(self):
+        return AnswerModifier(Answer="".join(self.stream()))
+
+    def cancel(self):
+        """Stop generating, drop whatever was produced and leave the chat log untouched."""
+        self.cancelled.set()
+        self.close()
+        with speculation_lock:
+            speculation_stats["cancelled"] += 1
+            speculation_stats["wasted_chars"] += self.generated
+            speculation_stats["wasted_seconds"] += time.perf_counter() - self.started
 
 # Main program entry point.
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+import json  # Summary persistence.
+import os
+import threading  # Summaries are refreshed on a background thread.
+from dotenv import dotenv_values  # Budgets are configured in .env.
+from Backend.Providers import GetGroq  # Shared pooled Groq client.
+from Backend.ConversationBuffer import EstimateTokens  # Shared local token estimate.
+from Backend.Tracing import Span  # Summary refresh timing.
+
+env_vars = dotenv_values(".env")
+
+# Token budget for the chat history sent with each request, and how many recent messages
+# are always sent verbatim even if they alone exceed it.
+HistoryTokens = int(env_vars.get("ContextHistoryTokens", 3000))
+KeepRecent = int(env_vars.get("ContextKeepRecent", 4))
+SummaryFile = env_vars.get("ContextSummaryFile", rf"Data\ChatSummary.json")
+
+# The shared Groq client is fetched on first use so importing this module stays cheap.
+client = None
+
+def GetClient():
+    global client
+    if client is None:
+        client = GetGroq()
+    return client
+
+
+def Summarize(messages, previous=""):
+    """Fold older messages into a short running summary of the conversation."""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)[-12000:]
+    completion = GetClient().chat.completions.create(
+        model="llama3-8b-8192",
+        messages=[
+            {"role": "system", "content": "Summarize the conversation for a chatbot's memory in at most 120 words. Keep names, facts, preferences and open questions. Reply with the summary only."},
+            {"role": "user", "content": f"Earlier summary:\n{previous or '(none)'}\n\nNew messages:\n{transcript}"},
+        ],
+        max_tokens=256,
+        temperature=0.2,
+        stream=False,
+    )
+    return completion.choices[0].message.content.strip()
+
+
+def MessageCost(message):
+    return EstimateTokens(message.get("content", "")) + 4  # Role and framing overhead.
+
+
+class ContextWindow:
+    """Fits chat history into a token budget: recent messages verbatim, older ones as a cached summary.
+
+    The summary is refreshed on a background thread when more messages fall out of the window;
+    until then the previous summary is sent, so no request waits for summarization.
+    """
+
+    def __init__(self, budget=HistoryTokens, keep_recent=KeepRecent, summarize=Summarize, path=SummaryFile):
+        self.budget = budget
+        self.keep_recent = keep_recent
+        self.summarize = summarize
+        self.path = path
+        self.lock = threading.Lock()
+        self.summary = ""
+        self.covered = None  # Last message folded into the summary.
+        self.refreshing = False
+        self.loaded = False
+
+    def load(self):
+        # Called with the lock held, on first use.
+        self.loaded = True
+        try:
+            with open(self.path, "r", encoding='utf-8') as file:
+                data = json.load(file)
+            self.summary = data.get("summary", "")
+            self.covered = data.get("covered")
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding='utf-8') as file:
+                json.dump({"summary": self.summary, "covered": self.covered}, file)
+        except OSError as e:
+            print(f"[WARNING] Could not save the conversation summary: {e}")
+
+    def fit(self, messages):
+        """Return the messages to send: an optional summary message followed by the newest messages that fit."""
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            summary = self.summary
+
+        budget = self.budget - (EstimateTokens(summary) + 8 if summary else 0)
+        used = 0
+        start = len(messages)
+        while start > 0:
+            cost = MessageCost(messages[start - 1])
+            if used + cost > budget and len(messages) - start >= self.keep_recent:
+                break
+            used += cost
+            start -= 1
+
+        older = messages[:start]
+        if older:
+            self.refresh(older)
+        if not summary or not older:
+            return list(messages[start:])
+        return [{"role": "system", "content": f"Summary of the earlier conversation: {summary}"}] + list(messages[start:])
+
+    def refresh(self, older):
+        """Summarize the messages that fell out of the window since the last refresh, in the background."""
+        with self.lock:
+            if self.refreshing or (older and older[-1] == self.covered):
+                return
+            self.refreshing = True
+            covered = self.covered
+            previous = self.summary
+
+        # Only the messages after the last summarized one are new; if it scrolled away, start over.
+        new = older
+        if covered in older:
+            new = older[len(older) - older[::-1].index(covered):]
+
+        def Run():
+            try:
+                with Span("ContextSummary"):
+                    summary = self.summarize(new, previous)
+                with self.lock:
+                    self.summary = summary
+                    self.covered = older[-1]
+                    self.save()
+            except Exception as e:
+                print(f"[WARNING] Conversation summary refresh failed: {e}")
+            finally:
+                with self.lock:
+                    self.refreshing = False
+
+        threading.Thread(target=Run, daemon=True).start()
+
+
+# Shared by the chatbot and the realtime search engine, which send the same chat history.
+context_window = ContextWindow()
@@ -0,0 +1,143 @@
+import threading  # Buffers are appended to from worker threads.
+from dotenv import dotenv_values  # Budgets are configured in .env.
+
+env_vars = dotenv_values(".env")
+
+# Default budgets for every buffer; each module may pass its own.
+MaxMessages = int(env_vars.get("ConversationMaxMessages", 20))
+MaxTokens = int(env_vars.get("ConversationMaxTokens", 2048))
+
+
+def EstimateTokens(text):
+    """Rough token count (about four characters per token), good enough for budgeting."""
+    return max(1, len(str(text)) // 4)
+
+
+class ConversationBuffer(list):
+    """A list of chat messages that drops its oldest entries to stay within a message and token budget.
+
+    It is a real list, so `SystemChatBot + messages` and json.dump keep working unchanged. Every
+    list method that changes it is overridden to take the lock and keep the token count and the
+    budget; reads are the plain list ones.
+    """
+
+    def __init__(self, name, max_messages=None, max_tokens=None):
+        super().__init__()
+        self.name = name
+        self.max_messages = MaxMessages if max_messages is None else max_messages
+        self.max_tokens = MaxTokens if max_tokens is None else max_tokens
+        self.lock = threading.Lock()
+        self.tokens = 0
+        self.appended = 0
+        self.evicted = 0
+        self.peak_messages = 0
+        self.peak_tokens = 0
+        buffers.append(self)
+
+    def cost(self, message):
+        return EstimateTokens(message.get("content", "")) if isinstance(message, dict) else EstimateTokens(message)
+
+    def trim(self):
+        # Called with the lock held; the newest message is always kept.
+        while len(self) > 1 and (len(self) > self.max_messages or self.tokens > self.max_tokens):
+            self.drop_oldest()
+        # Never start with an answer whose question was dropped.
+        while len(self) > 1 and isinstance(self[0], dict) and self[0].get("role") == "assistant":
+            self.drop_oldest()
+        self.peak_messages = max(self.peak_messages, len(self))
+        self.peak_tokens = max(self.peak_tokens, self.tokens)
+
+    def drop_oldest(self):
+        self.tokens -= self.cost(super().pop(0))
+        self.evicted += 1
+
+    def recount(self):
+        # Called with the lock held after a change that may have replaced or reordered messages.
+        self.tokens = sum(self.cost(message) for message in self)
+        self.trim()
+
+    def append(self, message):
+        with self.lock:
+            super().append(message)
+            self.tokens += self.cost(message)
+            self.appended += 1
+            self.trim()
+
+    def extend(self, messages):
+        for message in list(messages):  # A copy, so buffer.extend(buffer) ends.
+            self.append(message)
+
+    def __iadd__(self, messages):
+        self.extend(messages)
+        return self
+
+    def insert(self, index, message):
+        with self.lock:
+            super().insert(index, message)
+            self.appended += 1
+            self.recount()
+
+    def __setitem__(self, index, value):
+        with self.lock:
+            super().__setitem__(index, value)
+            self.recount()
+
+    def __delitem__(self, index):
+        with self.lock:
+            super().__delitem__(index)
+            self.recount()
+
+    def __imul__(self, count):
+        with self.lock:
+            super().__imul__(count)
+            self.recount()
+        return self
+
+    def pop(self, index=-1):
+        with self.lock:
+            message = super().pop(index)
+            self.tokens -= self.cost(message)
+            return message
+
+    def remove(self, message):
+        with self.lock:
+            super().remove(message)
+            self.tokens -= self.cost(message)
+
+    def sort(self, *args, **kwargs):
+        with self.lock:
+            super().sort(*args, **kwargs)
+            self.trim()
+
+    def reverse(self):
+        with self.lock:
+            super().reverse()
+            self.trim()
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+            self.tokens = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "messages": len(self),
+                "tokens": self.tokens,
+                "chars": sum(len(str(m.get("content", "")) if isinstance(m, dict) else str(m)) for m in self),
+                "appended": self.appended,
+                "evicted": self.evicted,
+                "peak_messages": self.peak_messages,
+                "peak_tokens": self.peak_tokens,
+                "max_messages": self.max_messages,
+                "max_tokens": self.max_tokens,
+            }
+
+
+# Every buffer created in this process, for the memory report.
+buffers = []
+
+
+def BufferStats():
+    """Size of every conversation buffer; the peaks stay at the budget however long the session runs."""
+    return {buffer.name: buffer.stats() for buffer in buffers}
@@ -0,0 +1,45 @@
+import contextvars  # Carries the caller's turn ID into the pool threads.
+from concurrent.futures import ThreadPoolExecutor  # Bounded pool shared by all turns.
+
+
+class Dispatcher:
+    """Runs the decisions of one turn concurrently and returns their results in decision order."""
+
+    def __init__(self, handlers, max_workers=4):
+        # handlers is an ordered list of (prefix, callable(decision)); the first matching prefix wins.
+        self.handlers = list(handlers)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="intent")
+
+    def handler_for(self, decision):
+        for prefix, handler in self.handlers:
+            if decision.startswith(prefix):
+                return handler
+        return None
+
+    def submit(self, decision):
+        """Start a single decision right away; returns a Future, or None if no handler matches."""
+        handler = self.handler_for(decision)
+        if handler is None:
+            print(f"[WARNING] No handler for decision: {decision}")
+            return None
+        return self.executor.submit(contextvars.copy_context().run, handler, decision)
+
+    def gather(self, futures):
+        """Wait for (decision, future) pairs and return (decision, result) pairs in the same order."""
+        results = []
+        for decision, future in futures:
+            result = None
+            if future is not None:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Decision '{decision}' failed: {e}")
+            results.append((decision, result))
+        return results
+
+    def dispatch(self, decisions):
+        """Fan all decisions out at once; wall-clock time is that of the slowest one."""
+        return self.gather([(decision, self.submit(decision)) for decision in decisions])
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
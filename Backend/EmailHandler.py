@@ -124,7 +124,7 @@ Example output format:
     # Try Cohere API first if selected and key available
     if provider == "cohere" and COHERE_API_KEY:
         try:
-            import requests
+            from Backend.Providers import HttpClient  # Pooled keep-alive connections.
             url = "https://api.cohere.ai/v1/chat"
             headers = {
                 "Authorization": f"Bearer {COHERE_API_KEY}", 
@@ -137,7 +137,7 @@ Example output format:
                 "temperature": 0.4,
                 "max_tokens": 1000
             }
-            resp = requests.post(url, headers=headers, json=data, timeout=10)
+            resp = HttpClient().post(url, headers=headers, json=data, timeout=10)
             resp.raise_for_status()
             result = resp.json()
             
@@ -164,7 +164,7 @@ Example output format:
     # Try Groq API if selected and key available
     if provider == "groq" and GROQ_API_KEY:
         try:
-            import requests
+            from Backend.Providers import HttpClient  # Pooled keep-alive connections.
             url = "https://api.groq.com/openai/v1/chat/completions"
             headers = {
                 "Authorization": f"Bearer {GROQ_API_KEY}", 
@@ -180,7 +180,7 @@ Example output format:
                 "max_tokens": 1000,
                 "response_format": {"type": "json_object"}
             }
-            resp = requests.post(url, headers=headers, json=data, timeout=10)
+            resp = HttpClient().post(url, headers=headers, json=data, timeout=10)
             resp.raise_for_status()
             
             # Parse the response
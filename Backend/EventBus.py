@@ -0,0 +1,141 @@
+import os  # For building mirror file paths.
+import queue  # Thread-safe queues handed out to subscribers.
+import threading  # Lock protecting the subscriber table.
+import time  # Timestamps for the wakeup counter.
+from collections import deque  # Sliding window of wakeup timestamps.
+
+# Topics exchanged between the assistant worker and the GUI.
+MIC = "mic"            # "True" while the microphone button is active, otherwise "False".
+STATUS = "status"      # Assistant status line, e.g. "Listening..." or "Available...".
+RESPONSE = "response"  # Text to append to the chat screen.
+IMAGE = "image"        # Image job progress: {"prompt", "state", "detail"}.
+PARTIAL = "partial"    # (first, text): text added to an answer that is still streaming in.
+
+# File names used by the optional debug mirror (the files the GUI used to poll).
+MirrorFiles = {
+    MIC: "Mic.data",
+    STATUS: "Status.data",
+    RESPONSE: "Responses.data",
+}
+
+
+class RateCounter:
+    """Counts events over a sliding one-minute window."""
+
+    def __init__(self, window=60.0):
+        self.window = window
+        self.total = 0
+        self._hits = deque()
+        self._lock = threading.Lock()
+
+    def hit(self):
+        now = time.monotonic()
+        with self._lock:
+            self.total += 1
+            self._hits.append(now)
+            self._trim(now)
+
+    def per_minute(self):
+        with self._lock:
+            self._trim(time.monotonic())
+            return len(self._hits) * 60.0 / self.window
+
+    def _trim(self, now):
+        while self._hits and now - self._hits[0] > self.window:
+            self._hits.popleft()
+
+
+class EventBus:
+    """Thread-safe publish/subscribe bus that also remembers the latest value of every topic."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._subscribers = []  # List of (topics, queue) pairs.
+        self._sinks = []
+        self._conditions = {}  # Per-topic conditions sharing the bus lock.
+
+    def _condition(self, topic):
+        # Caller must hold self._lock.
+        condition = self._conditions.get(topic)
+        if condition is None:
+            condition = self._conditions[topic] = threading.Condition(self._lock)
+        return condition
+
+    def publish(self, topic, value):
+        """Store the value as the latest for the topic and deliver it to every subscriber."""
+        with self._lock:
+            self._latest[topic] = value
+            self._condition(topic).notify_all()
+            targets = [q for topics, q in self._subscribers if topic in topics]
+            sinks = list(self._sinks)
+
+        for q in targets:
+            q.put((topic, value))
+
+        for sink in sinks:
+            try:
+                sink(topic, value)
+            except Exception as e:
+                print(f"[WARNING] Event sink failed for '{topic}': {e}")
+
+    def latest(self, topic, default=""):
+        """Return the last value published on the topic without blocking."""
+        with self._lock:
+            return self._latest.get(topic, default)
+
+    def wait_for(self, topic, predicate, timeout=None, wakeups=None):
+        """Block until predicate(latest value) is true; only publishes on this topic wake the caller.
+
+        Every wakeup that does not satisfy the predicate is recorded on the optional RateCounter.
+        Returns True once the predicate holds, or False if the timeout expired.
+        """
+        with self._lock:
+            condition = self._condition(topic)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not predicate(self._latest.get(topic)):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                condition.wait(remaining)
+                if wakeups is not None and not predicate(self._latest.get(topic)):
+                    wakeups.hit()
+            return True
+
+    def subscribe(self, *topics):
+        """Return a queue that receives (topic, value) tuples for the given topics."""
+        q = queue.Queue()
+        with self._lock:
+            self._subscribers.append((frozenset(topics), q))
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers = [(topics, sq) for topics, sq in self._subscribers if sq is not q]
+
+    def add_sink(self, sink):
+        """Register a callable(topic, value) invoked synchronously on every publish."""
+        with self._lock:
+            self._sinks.append(sink)
+
+    def remove_sink(self, sink):
+        with self._lock:
+            self._sinks = [s for s in self._sinks if s is not sink]
+
+
+class FileMirrorSink:
+    """Debug sink that mirrors bus traffic into the legacy Frontend/Files/*.data files."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def __call__(self, topic, value):
+        filename = MirrorFiles.get(topic)
+        if filename is None:
+            return
+        with open(os.path.join(self.directory, filename), "w", encoding='utf-8') as file:
+            file.write(str(value))
+
+
+# Process-wide bus shared by the GUI and the backend modules.
+bus = EventBus()
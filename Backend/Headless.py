@@ -0,0 +1,143 @@
+import contextlib  # Keeps debug prints off the JSON-lines stream.
+import json  # Queries may be JSON objects; results are JSON lines.
+import socketserver  # Local socket front end.
+import sys  # stdin/stdout defaults.
+import threading  # Protects the answer table.
+import time  # Per-query timing.
+from collections import deque  # In-order window of running queries.
+from concurrent.futures import ThreadPoolExecutor  # Parallel batch execution.
+
+from Backend.Tracing import BeginTurn, CurrentTurn, tracer
+
+# Text-only driver for the assistant: queries come from stdin, a file or a local socket,
+# go through the same decision path as spoken ones, and answers are written as JSON lines.
+
+
+def ParseQuery(line):
+    """Accept either a plain text line or a JSON object with a "query" field."""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            return str(json.loads(line).get("query", "")).strip() or None
+        except ValueError:
+            pass
+    return line
+
+
+class Headless:
+    """Runs queries through an execute(query) callable and collects what would have been spoken."""
+
+    def __init__(self, execute, workers=1):
+        self.execute = execute
+        self.workers = max(1, workers)
+        self.answers = {}
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def sink(self, text):
+        """Replacement for the speakers: remembers each answer under the current turn."""
+        with self.lock:
+            self.answers.setdefault(CurrentTurn.get(), []).append(str(text))
+
+    def run_one(self, query):
+        turn_id = BeginTurn()
+        start = time.perf_counter()
+        error = None
+        try:
+            self.execute(query)
+        except Exception as e:
+            error = str(e)
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.count += 1
+            answers = self.answers.pop(turn_id, [])
+        stages = {}
+        for span in tracer.snapshot()["turns"].get(turn_id, []):
+            stages[span["stage"]] = round(stages.get(span["stage"], 0) + span["ms"], 2)
+
+        return {
+            "turn": turn_id,
+            "query": query,
+            "answers": answers,
+            "ok": error is None,
+            "error": error,
+            "ms": round(elapsed * 1000, 2),
+            "stages": stages,
+        }
+
+    def run_stream(self, lines, write):
+        """Execute queries with up to `workers` in flight, writing results in input order."""
+        start = time.perf_counter()
+        total = 0
+        window = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="headless") as executor:
+            for line in lines:
+                query = ParseQuery(line)
+                if query is None:
+                    continue
+                window.append(executor.submit(self.run_one, query))
+                if len(window) >= self.workers * 2:
+                    write(json.dumps(window.popleft().result()))
+                    total += 1
+            while window:
+                write(json.dumps(window.popleft().result()))
+                total += 1
+
+        elapsed = time.perf_counter() - start
+        return {"queries": total, "elapsed_s": round(elapsed, 4), "queries_per_s": round(total / elapsed, 2) if elapsed else None}
+
+    def serve(self, host, port):
+        """Accept newline-separated queries on a local TCP socket; each connection gets JSON lines back."""
+        headless = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                lines = (raw.decode("utf-8", errors="replace") for raw in self.rfile)
+
+                def Write(text):
+                    self.wfile.write((text + "\n").encode("utf-8"))
+                    self.wfile.flush()
+
+                headless.run_stream(lines, Write)
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        with Server((host, port), Handler) as server:
+            print(f"[INFO] Headless assistant listening on {host}:{port}", file=sys.stderr)
+            server.serve_forever()
+
+
+def RunHeadless(headless, input_path=None, output_path=None, socket_address=None, stdout=None):
+    """Feed queries from a socket, a file or stdin to a Headless runner.
+
+    Results go to output_path, or to stdout (default sys.stdout). Everything else the assistant
+    prints ([DEBUG] lines, rich output) goes to stderr while it runs, so stdout carries only JSON lines.
+    """
+    stdout = stdout or sys.stdout
+    if socket_address:
+        host, _, port = socket_address.rpartition(":")
+        with contextlib.redirect_stdout(sys.stderr):
+            headless.serve(host or "127.0.0.1", int(port))
+        return headless
+
+    source = open(input_path, "r", encoding='utf-8') if input_path else sys.stdin
+    target = open(output_path, "w", encoding='utf-8') if output_path else stdout
+    try:
+        def Write(text):
+            target.write(text + "\n")
+            target.flush()
+
+        with contextlib.redirect_stdout(sys.stderr):
+            summary = headless.run_stream(source, Write)
+        print(f"[INFO] {json.dumps(summary)}", file=sys.stderr)
+    finally:
+        if input_path:
+            source.close()
+        if output_path:
+            target.close()
+    return headless
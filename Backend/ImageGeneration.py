@@ -1,12 +1,19 @@
 import asyncio
+import atexit
 import os
+import queue
 import sys
 import logging
+import threading
 from random import randint
 from PIL import Image, ImageFile
 from time import sleep
 import requests
 from dotenv import load_dotenv, get_key
+try:
+    from Backend.Tracing import Traced
+except ImportError:  # Running as a standalone script from inside Backend/.
+    from Tracing import Traced
 import traceback
 
 # Configure logging
@@ -42,7 +49,6 @@ API_KEY = os.getenv("HuggingFaceAPIKey")
 
 if not API_KEY:
     logger.error("HuggingFaceAPIKey not found in environment variables")
-    sys.exit(1)
 
 headers = {
     "Authorization": f"Bearer {API_KEY}",
@@ -86,7 +92,7 @@ def open_images(prompt):
     return True
 
 # Async function to send a query to the API
-async def query(payload, retry_count=3, timeout=30):
+async def query(payload, retry_count=3, timeout=30, session=None):
     """Send a query to the Hugging Face API with retry logic."""
     for attempt in range(retry_count):
         try:
@@ -96,7 +102,7 @@ async def query(payload, retry_count=3, timeout=30):
             # Use aiohttp for better async performance
             import aiohttp
             
-            async with aiohttp.ClientSession() as session:
+            async with OptionalSession(session) as session:
                 async with session.post(
                     API_URL,
                     headers=headers,
@@ -135,6 +141,24 @@ async def query(payload, retry_count=3, timeout=30):
     
     return None
 
+class OptionalSession:
+    """Use the caller's aiohttp session if given, otherwise open (and close) a temporary one."""
+
+    def __init__(self, session=None):
+        self.session = session
+        self.owned = None
+
+    async def __aenter__(self):
+        if self.session is not None:
+            return self.session
+        import aiohttp
+        self.owned = aiohttp.ClientSession()
+        return self.owned
+
+    async def __aexit__(self, *exc):
+        if self.owned is not None:
+            await self.owned.close()
+
 # Async function to generate 4 images from prompt
 def clean_prompt(prompt: str) -> str:
     """Clean and format the prompt for better results."""
@@ -167,7 +191,8 @@ def clean_prompt(prompt: str) -> str:
     
     return prompt
 
-async def generate_images(prompt: str) -> bool:
+@Traced("generate_images")
+async def generate_images(prompt: str, session=None) -> bool:
     """Generate images based on the given prompt."""
     try:
         # Clean and prepare the prompt
@@ -189,7 +214,7 @@ async def generate_images(prompt: str) -> bool:
                     "use_cache": False
                 }
             }
-            tasks.append(query(payload))
+            tasks.append(query(payload, session=session))
         
         # Run all tasks concurrently
         image_bytes_list = await asyncio.gather(*tasks)
@@ -253,6 +278,94 @@ def GenerateImages(prompt: str) -> bool:
         logger.error(f"Error in GenerateImages: {str(e)}", exc_info=True)
         return False
 
+class ImageWorker:
+    """Long-lived in-process image generator fed through a job queue.
+
+    Each worker thread keeps its own event loop and aiohttp session, so jobs do not pay for
+    interpreter start-up, dotenv loading or imports. Progress is published on the event bus
+    IMAGE topic as {"prompt", "state", "detail"} dictionaries.
+    """
+
+    def __init__(self, max_concurrent=1, max_pending=8):
+        self.jobs = queue.Queue(maxsize=max_pending)
+        self.threads = []
+        self.stopping = False
+        for index in range(max(1, max_concurrent)):
+            thread = threading.Thread(target=self._run, name=f"image-worker-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _publish(self, prompt, state, detail=""):
+        from Backend.EventBus import bus, IMAGE
+        bus.publish(IMAGE, {"prompt": prompt, "state": state, "detail": detail})
+
+    def submit(self, prompt: str) -> bool:
+        """Queue a prompt; returns False if the worker is shutting down or already has too many jobs."""
+        if self.stopping:
+            return False
+        try:
+            self.jobs.put_nowait(prompt)
+        except queue.Full:
+            self._publish(prompt, "failed", "Image generator is busy, try again shortly.")
+            return False
+        self._publish(prompt, "queued")
+        return True
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        session = None
+        try:
+            while True:
+                prompt = self.jobs.get()
+                if prompt is None:
+                    break
+                if session is None:
+                    session = loop.run_until_complete(self._open_session())
+                self._publish(prompt, "generating")
+                try:
+                    clean_prompt_text = clean_prompt(prompt)
+                    success = loop.run_until_complete(generate_images(clean_prompt_text, session=session))
+                    if success:
+                        open_images(clean_prompt_text)
+                        self._publish(prompt, "done", f"Images for '{prompt}' are ready.")
+                    else:
+                        self._publish(prompt, "failed", f"Sorry, I could not generate images for '{prompt}'.")
+                except Exception as e:
+                    logger.error(f"Image job failed: {str(e)}", exc_info=True)
+                    self._publish(prompt, "failed", f"Sorry, I could not generate images for '{prompt}'.")
+        finally:
+            if session is not None:
+                loop.run_until_complete(session.close())
+            loop.close()
+
+    async def _open_session(self):
+        import aiohttp
+        return aiohttp.ClientSession()
+
+    def shutdown(self, timeout=5):
+        """Drop pending jobs, let running ones finish and stop the worker threads."""
+        self.stopping = True
+        try:
+            while True:
+                self.jobs.get_nowait()
+        except queue.Empty:
+            pass
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+
+image_worker = None
+
+def GetImageWorker(max_concurrent=1):
+    """Return the process-wide image worker, starting it on first use."""
+    global image_worker
+    if image_worker is None:
+        image_worker = ImageWorker(max_concurrent=max_concurrent)
+        atexit.register(image_worker.shutdown)
+    return image_worker
+
 def read_status_file():
     """Read and parse the status file."""
     try:
@@ -325,6 +438,9 @@ async def ImageGenerationLoop():
             await asyncio.sleep(5)  # Prevent tight loop on error
 
 if __name__ == "__main__":
+    if not API_KEY:
+        sys.exit(1)
+
     try:
         # Ensure the event loop is properly configured
         if sys.platform == 'win32':
@@ -0,0 +1,230 @@
+import json  # Decision log persistence.
+import math  # Feature normalization.
+import os
+import queue  # New examples waiting for the trainer.
+import random  # Replays older examples while learning new ones.
+import re
+import threading  # Background trainer.
+import time  # Prediction timing.
+import zlib  # Stable feature hashing across runs.
+from collections import deque  # Bounded example memory.
+
+try:
+    import numpy as np  # Optional: without it the model simply never serves.
+except ImportError:
+    np = None
+
+# Small on-CPU intent classifier: hashed word and character n-grams feeding a softmax
+# linear model. It learns from the few-shot ChatHistory and from every decision the
+# Cohere path makes, and answers for the labels whose decision is the query itself.
+
+HashBits = 14
+Compound = "compound"  # Queries the model split into several tasks.
+
+
+def Features(query, bits=HashBits):
+    """Hashed word 1-2 grams and character 3-grams, L2-normalized, as {index: value}."""
+    text = " ".join(re.sub(r"[^\w\s']", " ", query.lower()).split())
+    words = text.split()
+    grams = [f"w:{word}" for word in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    padded = f" {text} "
+    grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+
+    mask = (1 << bits) - 1
+    counts = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode("utf-8")) & mask
+        counts[index] = counts.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(value * value for value in counts.values())) or 1.0
+    return {index: value / norm for index, value in counts.items()}
+
+
+def LabelOf(decision, funcs):
+    """The class a decision list belongs to: its function keyword, or "compound" for several tasks."""
+    if len(decision) != 1:
+        return Compound
+    for func in funcs:
+        if decision[0].startswith(func):
+            return func
+    return None
+
+
+class IntentModel:
+    """Softmax regression over hashed n-grams, trained in the background and swapped in when ready."""
+
+    def __init__(self, labels, log_path, serve=("general", "realtime"), threshold=0.85,
+                 min_examples=50, memory=5000, bits=HashBits):
+        self.labels = list(labels) + [Compound]
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.log_path = log_path
+        self.serve = set(serve)
+        self.threshold = threshold
+        self.min_examples = min_examples
+        self.bits = bits
+        self.examples = deque(maxlen=memory)
+        self.pending = queue.Queue()
+        self.lock = threading.Lock()
+        self.log_lock = threading.Lock()  # Serializes appends to and compaction of the decision log.
+        self.log_lines = None  # Lines in the decision log, counted on the first append.
+        self.weights = None
+        self.bias = None
+        self.ready = False
+        self.started = False
+        self.served = 0
+        self.declined = 0
+        self.predict_seconds = 0.0
+
+    @property
+    def available(self):
+        return np is not None
+
+    # ---------- training ----------
+
+    def start(self, seed_examples=()):
+        """Train from the seed examples and the decision log on a background thread, then keep learning."""
+        with self.lock:
+            if self.started or not self.available:
+                return
+            self.started = True
+        threading.Thread(target=self.train_loop, args=(list(seed_examples),), daemon=True).start()
+
+    def load_log(self):
+        examples = []
+        try:
+            with open(self.log_path, "r", encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                        examples.append((record["query"], record["decision"]))
+                    except (ValueError, KeyError):
+                        continue
+        except OSError:
+            pass
+        return examples[-self.examples.maxlen:]
+
+    def encode(self, query, decision):
+        label = LabelOf(decision, self.labels)
+        if label is None:
+            return None
+        features = Features(query, self.bits)
+        return (np.fromiter(features.keys(), dtype=np.int64, count=len(features)),
+                np.fromiter(features.values(), dtype=np.float32, count=len(features)),
+                self.index[label])
+
+    def step(self, example, rate):
+        indices, values, target = example
+        with self.lock:
+            scores = values @ self.weights[indices] + self.bias
+            scores = np.exp(scores - scores.max())
+            gradient = scores / scores.sum()
+            gradient[target] -= 1.0
+            self.weights[indices] -= rate * np.outer(values, gradient)
+            self.bias -= rate * gradient
+
+    def train_loop(self, seed_examples, epochs=8, rate=0.5):
+        with self.lock:
+            self.weights = np.zeros((1 << self.bits, len(self.labels)), dtype=np.float32)
+            self.bias = np.zeros(len(self.labels), dtype=np.float32)
+
+        for query, decision in seed_examples + self.load_log():
+            encoded = self.encode(query, decision)
+            if encoded is not None:
+                self.examples.append(encoded)
+
+        for _ in range(epochs):
+            order = list(self.examples)
+            random.shuffle(order)
+            for example in order:
+                self.step(example, rate)
+        self.ready = True
+        print(f"[INFO] Intent model trained on {len(self.examples)} examples.")
+
+        # Incremental updates: each new example plus a few older ones so earlier classes are not forgotten.
+        while True:
+            query, decision = self.pending.get()
+            encoded = self.encode(query, decision)
+            if encoded is None:
+                continue
+            self.examples.append(encoded)
+            for _ in range(3):
+                self.step(encoded, rate)
+            for example in random.sample(list(self.examples), min(16, len(self.examples))):
+                self.step(example, rate)
+
+    def learn(self, query, decision):
+        """Log a decision made by the Cohere path and queue it for the background trainer."""
+        try:
+            with self.log_lock:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                if self.log_lines is None:
+                    self.log_lines = self.count_log()
+                with open(self.log_path, "a", encoding='utf-8') as file:
+                    file.write(json.dumps({"query": query, "decision": list(decision)}) + "\n")
+                self.log_lines += 1
+                # Training only reads the newest `memory` examples, so the log is kept below twice that.
+                if self.log_lines >= 2 * self.examples.maxlen:
+                    self.compact_log()
+        except OSError as e:
+            print(f"[WARNING] Could not log the decision: {e}")
+        if self.started:
+            self.pending.put((query, list(decision)))
+
+    def count_log(self):
+        # Called with log_lock held.
+        try:
+            with open(self.log_path, "rb") as file:
+                return sum(1 for _ in file)
+        except FileNotFoundError:
+            return 0
+
+    def compact_log(self):
+        # Called with log_lock held: keep the newest `memory` lines.
+        with open(self.log_path, "r", encoding='utf-8') as file:
+            lines = deque(file, maxlen=self.examples.maxlen)
+        temporary = self.log_path + ".tmp"
+        with open(temporary, "w", encoding='utf-8') as file:
+            file.writelines(lines)
+        os.replace(temporary, self.log_path)
+        self.log_lines = len(lines)
+
+    # ---------- serving ----------
+
+    def classify(self, query):
+        """Return (label, probability), or (None, 0.0) before the first training pass has finished."""
+        if not self.ready:
+            return None, 0.0
+        features = Features(query, self.bits)
+        indices = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+        values = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+        with self.lock:
+            scores = values @ self.weights[indices] + self.bias
+        scores = np.exp(scores - scores.max())
+        probabilities = scores / scores.sum()
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def predict(self, query):
+        """The decision list for the query if the model is confident enough, else None."""
+        if not self.ready or len(self.examples) < self.min_examples:
+            return None
+        start = time.perf_counter()
+        label, probability = self.classify(query)
+        self.predict_seconds += time.perf_counter() - start
+        if label in self.serve and probability >= self.threshold:
+            self.served += 1
+            return [f"{label} {query}"]
+        self.declined += 1
+        return None
+
+    def stats(self):
+        predictions = self.served + self.declined
+        return {
+            "available": self.available,
+            "ready": self.ready,
+            "examples": len(self.examples),
+            "served": self.served,
+            "declined": self.declined,
+            "serve_rate": round(self.served / predictions, 4) if predictions else None,
+            "mean_predict_us": round(self.predict_seconds / predictions * 1e6, 1) if predictions else None,
+        }
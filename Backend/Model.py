@@ -1,8 +1,18 @@
-import cohere  # Import the Cohere library for AI services.
+from Backend.Providers import GetCohere  # Shared pooled Cohere client.
 from rich import print  # Import the Rich library to enhance terminal outputs.
 from dotenv import dotenv_values  # Import dotenv to load environment variables from a .env file.
+from Backend.Tracing import Traced  # Per-stage latency spans.
+from Backend.ConversationBuffer import ConversationBuffer  # Bounded message history.
+from Backend.IntentModel import IntentModel  # Local statistical intent classifier.
 import httpx  # For handling API connection exceptions.
 import re
+import atexit  # Unwritten decisions are saved on a normal exit.
+import threading  # Protects the fast-path counters and the decision cache.
+import time  # Decision cache expiry.
+import json  # Decision cache persistence.
+import os
+import hashlib  # Fingerprint of the prompt the cached decisions came from.
+from collections import OrderedDict  # LRU order of cached decisions.
 from datetime import datetime
 
 # Load environment variables from the env file.
@@ -11,8 +21,14 @@ env_vars = dotenv_values(".env")
 # Retrieve API key.
 CohereAPIKey = env_vars.get("CohereAPIKey")
 
-# Create a Cohere client using the provided API key.
-CO = cohere.Client(api_key=CohereAPIKey)
+# The shared Cohere client is fetched on first use so importing this module stays cheap.
+CO = None
+
+def GetClient():
+    global CO
+    if CO is None:
+        CO = GetCohere()
+    return CO
 
 # Define a list of recognized function keywords for task categorization.
 funcs = [
@@ -20,8 +36,8 @@ funcs = [
     "system", "content", "google search", "youtube search", "reminder", "alarm"
 ]
 
-# Initialize an empty list to store user messages.
-messages = []
+# Recent user messages, bounded so a long session does not grow without limit.
+messages = ConversationBuffer("Model.messages")
 
 # Define the preamble that guides the AI model on how to categorize queries.
 preamble = """ 
@@ -61,7 +77,7 @@ ChatHistory = [
 
 # Alarm query detection
 def detect_alarm_query(query: str):
-    pattern = rf'\bset\s+(an?\s+)?alarm\s+for\s+(\d{1,2})(?::(\d{2}))?\s*(AM|PM|am|pm)?'
+    pattern = r'\bset\s+(an?\s+)?alarm\s+for\s+(\d{1,2})(?::(\d{2}))?\s*(AM|PM|am|pm)?'
     match = re.search(pattern, query)
     if match:
         hour = int(match.group(2))
@@ -93,22 +109,336 @@ def detect_schedule_query(query: str):
         return [f"alarm {hour:02d}:{minute:02d}"]
     return None
 
-# Define the main function for decision-making on queries.
-def FirstLayerDMM(prompt: str = "test", depth: int = 0, max_depth: int = 2):
+# Local fast path: unambiguous commands are decided here without calling Cohere.
+# Set FastPathIntents=False in .env to send every query to the model.
+FastPathEnabled = str(env_vars.get("FastPathIntents", "True")).lower() != "false"
+
+# "open"/"launch" followed by an article ("launch the missiles", "open a timer") is left to the model.
+FastPathClauses = [
+    (re.compile(r'^(?:open|launch) (?!(?:a|an|the) )(?P<x>.+)$'), "open"),
+    (re.compile(r'^(?:close|kill|quit|exit) (?P<x>.+)$'), "close"),
+    (re.compile(r'^play (?P<x>.+)$'), "play"),
+    (re.compile(r'^(?:generate|create|make|draw) (?:an? )?(?:image|picture|photo) of (?P<x>.+)$'), "generate image"),
+    (re.compile(r'^(?:google search|search google for) (?:for )?(?P<x>.+)$'), "google search"),
+    (re.compile(r'^search (?:for )?(?P<x>.+) on google$'), "google search"),
+    (re.compile(r'^(?:youtube search|search youtube for) (?:for )?(?P<x>.+)$'), "youtube search"),
+    (re.compile(r'^search (?:for )?(?P<x>.+) on youtube$'), "youtube search"),
+]
+
+FastPathSystem = {
+    "mute": "mute", "mute volume": "mute", "unmute": "unmute", "unmute volume": "unmute",
+    "volume up": "volume up", "increase volume": "volume up", "turn volume up": "volume up", "turn the volume up": "volume up",
+    "volume down": "volume down", "decrease volume": "volume down", "turn volume down": "volume down", "turn the volume down": "volume down",
+}
+
+# Only a farewell or the assistant's name may follow the exit word; "quit chrome" closes chrome.
+FastPathName = re.escape(str(env_vars.get("Assistantname") or "assistant").lower())
+FastPathExit = re.compile(rf'^(?:ok(?:ay)? )?(?:good ?bye|bye|exit|quit)(?: (?:good ?bye|bye|{FastPathName}))?$')
+
+# Words that mean the user wants more than a command; those queries go to the model.
+FastPathQuestion = re.compile(r'\b(?:what|who|why|how|when|where|which|tell|explain|write|and then|about)\b')
+
+fast_path_lock = threading.Lock()
+fast_path_hits = 0
+fast_path_misses = 0
+
+
+def fast_path_clause(clause: str, previous: str = None):
+    """Decide a single clause, or return None if it is not an obvious command."""
+    alarm_check = detect_alarm_query(clause)
+    if alarm_check:
+        return alarm_check[0]
+    if clause in FastPathSystem:
+        return f"system {FastPathSystem[clause]}"
+    for pattern, func in FastPathClauses:
+        match = pattern.match(clause)
+        if match and len(match.group("x").split()) <= 6:
+            return f"{func} {match.group('x')}"
+    # "open chrome and firefox": a bare name continues the previous open/close.
+    if previous in ("open", "close") and 0 < len(clause.split()) <= 3:
+        return f"{previous} {clause}"
+    return None
+
+
+def detect_fast_path(query: str):
+    """Classify commands like "open chrome and firefox", "volume up" or "play despacito" locally.
+
+    Returns the decision list, or None when the query is ambiguous and needs the model.
+    """
+    text = re.sub(r'\s+', ' ', query.lower()).strip().rstrip(".!")
+    if not text or "?" in text or len(text.split()) > 12:
+        return None
+    if FastPathExit.match(text):
+        return ["exit"]
+    if FastPathQuestion.search(text):
+        return None
+
+    decisions = []
+    previous = None
+    for clause in re.split(r',\s*(?:and\s+)?|\s+and\s+|\s+then\s+', text):
+        clause = clause.strip()
+        if not clause:
+            continue
+        decision = fast_path_clause(clause, previous)
+        if decision is None:
+            if previous == "play" and decisions:
+                # "play rock and roll": the song title itself contained "and".
+                decisions[-1] = f"{decisions[-1]} and {clause}"
+                continue
+            return None
+        decisions.append(decision)
+        previous = next((func for func in ("open", "close", "play") if decision.startswith(func + " ")), None)
+    return decisions or None
+
+
+def count_fast_path(hit: bool):
+    global fast_path_hits, fast_path_misses
+    with fast_path_lock:
+        if hit:
+            fast_path_hits += 1
+        else:
+            fast_path_misses += 1
+
+
+def FastPathStats():
+    """How many decisions skipped the Cohere round trip so far."""
+    with fast_path_lock:
+        total = fast_path_hits + fast_path_misses
+        return {
+            "hits": fast_path_hits,
+            "misses": fast_path_misses,
+            "hit_rate": round(fast_path_hits / total, 4) if total else None,
+        }
+
+# Repeated queries reuse the model's earlier decision instead of another Cohere round trip.
+DecisionCacheFile = env_vars.get("DecisionCacheFile", r"Data\DecisionCache.json")
+DecisionCacheSize = int(env_vars.get("DecisionCacheSize", 256))
+DecisionCacheTTL = float(env_vars.get("DecisionCacheTTL", 7 * 24 * 3600))
+
+
+def normalize_query(query: str):
+    """Case, punctuation and whitespace do not change the decision."""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+
+def decision_fingerprint():
+    """Changes whenever the preamble, few-shot history or function list does, invalidating the cache."""
+    source = json.dumps([preamble, ChatHistory, funcs], sort_keys=True)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+class DecisionCache:
+    """Bounded LRU of normalized query -> decision list, with expiry, persisted to a JSON file.
+
+    Changes are written by a background thread shortly after they happen, so a burst of new
+    decisions costs one file write and callers never wait for the disk.
+    """
+
+    def __init__(self, path, capacity=256, ttl=7 * 24 * 3600, flush_ms=500):
+        self.path = path
+        self.capacity = capacity
+        self.ttl = ttl
+        self.delay = flush_ms / 1000
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.io_lock = threading.Lock()  # Serializes file writes between the writer and flush().
+        self.dirty = False
+        self.writer = None
+        self.hits = 0
+        self.misses = 0
+        self.loaded = False
+
+    def load(self):
+        # Called with the lock held, on first use.
+        self.loaded = True
+        try:
+            with open(self.path, "r", encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") != decision_fingerprint():
+            print("[INFO] Decision prompt changed; starting with an empty decision cache.")
+            return
+        now = time.time()
+        for key, (decision, stored) in data.get("entries", {}).items():
+            if now - stored < self.ttl:
+                self.entries[key] = (decision, stored)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def schedule_save(self):
+        # Called with the lock held: schedule a write by the background thread.
+        self.dirty = True
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write_loop, name="DecisionCacheWriter", daemon=True)
+            self.writer.start()
+        self.changed.notify_all()
+
+    def write_loop(self):
+        while True:
+            with self.lock:
+                while not self.dirty:
+                    self.changed.wait()
+            time.sleep(self.delay)  # Let the other decisions of a burst join this write.
+            self.save()
+
+    def save(self):
+        """Write the current entries if they changed since the last write."""
+        with self.io_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                self.dirty = False
+                entries = dict(self.entries)
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                temporary = self.path + ".tmp"
+                with open(temporary, "w", encoding='utf-8') as file:
+                    json.dump({"fingerprint": decision_fingerprint(), "entries": entries}, file)
+                os.replace(temporary, self.path)
+            except OSError as e:
+                print(f"[WARNING] Could not save the decision cache: {e}")
+
+    def get(self, query: str):
+        key = normalize_query(query)
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            entry = self.entries.get(key)
+            if entry is not None and time.time() - entry[1] >= self.ttl:
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0])
+
+    def put(self, query: str, decision):
+        key = normalize_query(query)
+        if not key or self.capacity <= 0:
+            return
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            self.entries[key] = (list(decision), time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+            self.schedule_save()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.loaded = True
+            self.schedule_save()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None,
+            }
+
+
+decision_cache = DecisionCache(DecisionCacheFile, DecisionCacheSize, DecisionCacheTTL)
+atexit.register(decision_cache.save)
+
+
+def DecisionCacheStats():
+    return decision_cache.stats()
+
+# Statistical intent model learned from ChatHistory and the decisions Cohere has made so far.
+# It only answers general/realtime queries it is confident about; everything else goes to Cohere.
+# Exit is never guessed: a wrong guess would end the session, and the fast path handles exit phrases.
+IntentModelEnabled = str(env_vars.get("IntentModel", "True")).lower() != "false"
+intent_model = IntentModel(
+    funcs,
+    env_vars.get("DecisionLogFile", r"Data\DecisionLog.jsonl"),
+    threshold=float(env_vars.get("IntentModelThreshold", 0.85)),
+    min_examples=int(env_vars.get("IntentModelMinExamples", 50)),
+)
+
+
+def chat_history_examples():
+    pairs = zip(ChatHistory[0::2], ChatHistory[1::2])
+    return [(user["message"], [task.strip() for task in bot["message"].split(",")]) for user, bot in pairs]
+
+
+def IntentModelStats():
+    return intent_model.stats()
+
+
+def split_decisions(chunks):
+    """Yield each comma-separated task of a streamed reply as soon as its comma (or the end) arrives."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk.replace("\n", "")
+        *tasks, buffer = buffer.split(",")
+        for task in tasks:
+            yield task.strip()
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def text_generation(stream):
+    for event in stream:
+        if event.event_type == "text-generation":
+            yield event.text
+
+
+# Streaming decision-making: each decision is yielded as soon as the model has finished it,
+# so the caller can start the first task while the rest is still being generated.
+@Traced("FirstLayerDMM")
+def FirstLayerDMMStream(prompt: str = "test", shortcuts: bool = True, on_remote=None):
+    # on_remote is called just before the query goes to Cohere, once every local shortcut has missed.
     messages.append({"role": "user", "content": prompt})
 
     alarm_check = detect_alarm_query(prompt)
     if alarm_check:
-        return alarm_check
+        yield from alarm_check
+        return
 
     schedule_check = detect_schedule_query(prompt)
     if schedule_check:
-        return schedule_check
-    
+        yield from schedule_check
+        return
+
     if "send email" in prompt.lower() or "mail" in prompt.lower():
-        return ["send_email"]
+        yield "send_email"
+        return
+
+    if FastPathEnabled and shortcuts:
+        fast_path = detect_fast_path(prompt)
+        count_fast_path(fast_path is not None)
+        if fast_path is not None:
+            yield from fast_path
+            return
+
+    if shortcuts:
+        cached = decision_cache.get(prompt)
+        if cached is not None:
+            yield from cached
+            return
+
+    if IntentModelEnabled and shortcuts:
+        intent_model.start(chat_history_examples())
+        predicted = intent_model.predict(prompt)
+        if predicted is not None:
+            yield from predicted
+            return
+
+    if on_remote is not None:
+        on_remote()
+
+    response = []
     try:
-        stream = CO.chat_stream(
+        stream = GetClient().chat_stream(
             model='command-r-plus',
             message=prompt,
             temperature=0.7,
@@ -118,36 +448,37 @@ def FirstLayerDMM(prompt: str = "test", depth: int = 0, max_depth: int = 2):
             preamble=preamble
         )
 
-        response = ""
-        for event in stream:
-            if event.event_type == "text-generation":
-                response += event.text
+        for task in split_decisions(text_generation(stream)):
+            if any(task.startswith(func) for func in funcs):
+                response.append(task)
+                yield task
 
     except httpx.ConnectError:
         print("[ERROR] Network issue while contacting Cohere API. Returning fallback decision.")
-        return [f"general {prompt}"]
+        if not response:
+            yield f"general {prompt}"
+        return
     except Exception as e:
         print(f"[ERROR] Unexpected error in FirstLayerDMM: {e}")
-        return [f"general {prompt}"]
+        if not response:
+            yield f"general {prompt}"
+        return
+
+    if not response:
+        yield f"general {prompt}"
+        return
 
-    response = response.replace("\n", "")
-    response = response.split(",")
-    response = [i.strip() for i in response]
+    decision_cache.put(prompt, response)
+    intent_model.learn(prompt, response)
 
-    temp = []
-    for task in response:
-        for func in funcs:
-            if task.startswith(func):
-                temp.append(task)
 
-    response = temp
-    if not response:
-        return [f"general {prompt}"]
+# Define the main function for decision-making on queries.
+def FirstLayerDMM(prompt: str = "test", depth: int = 0, max_depth: int = 2):
+    response = list(FirstLayerDMMStream(prompt, shortcuts=depth == 0))
 
     if "(query)" in response and depth < max_depth:
         return FirstLayerDMM(prompt=prompt, depth=depth + 1)
-    else:
-        return response
+    return response
 
 # Entry point for manual testing
 if __name__ == "__main__":
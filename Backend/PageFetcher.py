@@ -0,0 +1,379 @@
+import argparse  # Command line for the fixture benchmark.
+import asyncio  # Pages are downloaded side by side.
+import codecs  # Incremental decoding of streamed bytes.
+import json  # Benchmark report.
+import math
+import re
+import threading  # Blocking callers share one background event loop.
+import time  # Fetch timing.
+import weakref  # Per-host limits belong to their event loop.
+from collections import Counter  # Term frequencies for ranking passages.
+from html.parser import HTMLParser  # Streaming HTML parser from the standard library.
+from urllib.parse import urlsplit
+from dotenv import dotenv_values  # Limits come from .env.
+from Backend.ConversationBuffer import EstimateTokens  # Shared local token estimate.
+from Backend.Tracing import Span  # Fetch timing.
+
+env_vars = dotenv_values(".env")
+
+# Realtime answers used to see only the result URLs. The top pages are now downloaded at the
+# same time, their main text is extracted while the bytes arrive, and the passages most
+# relevant to the question are packed into a token budget for the prompt.
+
+PageFetchEnabled = str(env_vars.get("PageFetch", "True")).lower() != "false"
+PageCount = int(env_vars.get("FetchPages", 3))  # Result pages downloaded per question.
+FetchMaxBytes = int(env_vars.get("FetchMaxBytes", 400_000))  # Per page; the rest is not downloaded.
+FetchDeadline = float(env_vars.get("FetchDeadline", 3.0))  # Seconds for the whole stage.
+FetchPerHost = int(env_vars.get("FetchPerHost", 2))  # Concurrent requests to one host.
+PassageTokens = int(env_vars.get("PassageTokens", 1200))  # Budget for the packed passages.
+PassageWords = 80
+
+UserAgent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36'
+
+SkipTags = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "iframe", "button", "select", "template"}
+BlockTags = {"p", "div", "li", "h1", "h2", "h3", "h4", "h5", "h6", "article", "section", "main", "br", "tr", "td", "th",
+             "blockquote", "pre", "dd", "dt", "table", "ul", "ol", "figcaption"}
+MinBlockWords = 6  # Shorter blocks are menus, buttons and captions.
+
+Stopwords = {"a", "an", "the", "is", "are", "was", "were", "be", "of", "in", "on", "at", "to", "for", "and", "or",
+             "what", "who", "when", "where", "which", "how", "why", "does", "do", "did", "it", "its", "this", "that",
+             "with", "by", "from", "as", "about", "me", "tell", "please", "can", "you", "i"}
+
+
+class TextExtractor(HTMLParser):
+    """Collects the readable text blocks of a page as it is fed, skipping scripts and page chrome."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skipping = 0
+        self.in_title = False
+        self.title = ""
+        self.current = []
+        self.blocks = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SkipTags:
+            self.skipping += 1
+        elif tag == "title":
+            self.in_title = True
+        if tag in BlockTags:
+            self.end_block()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BlockTags:
+            self.end_block()
+
+    def handle_endtag(self, tag):
+        if tag in SkipTags:
+            self.skipping = max(0, self.skipping - 1)
+        elif tag == "title":
+            self.in_title = False
+        if tag in BlockTags:
+            self.end_block()
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title += data
+        elif not self.skipping:
+            self.current.append(data)
+
+    def end_block(self):
+        text = " ".join("".join(self.current).split())
+        self.current = []
+        if len(text.split()) >= MinBlockWords:
+            self.blocks.append(text)
+
+    def close(self):
+        super().close()
+        self.end_block()
+
+
+def ExtractText(html):
+    parser = TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return " ".join(parser.title.split()), parser.blocks
+
+
+class Page:
+    def __init__(self, url, rank, title="", blocks=None, size=0, ms=0.0, error=None):
+        self.url = url
+        self.rank = rank  # Position in the search results.
+        self.title = title
+        self.blocks = blocks or []
+        self.size = size
+        self.ms = ms
+        self.error = error
+
+
+# ---------- Fetching ----------
+
+host_limits = weakref.WeakKeyDictionary()  # event loop -> {host: Semaphore}
+stats_lock = threading.Lock()
+fetch_stats = {"pages": 0, "failed": 0, "truncated": 0, "late": 0, "bytes": 0, "seconds": 0.0}
+
+
+def HostLimit(host):
+    limits = host_limits.setdefault(asyncio.get_running_loop(), {})
+    if host not in limits:
+        limits[host] = asyncio.Semaphore(FetchPerHost)
+    return limits[host]
+
+
+def Count(**values):
+    with stats_lock:
+        for key, value in values.items():
+            fetch_stats[key] += value
+
+
+async def FetchPage(client, url, rank=0, deadline=None, max_bytes=FetchMaxBytes):
+    """Stream one page into the text extractor, stopping at max_bytes or the deadline (loop time).
+
+    A page still loading at the deadline keeps the text that had arrived by then.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = deadline or loop.time() + FetchDeadline
+    started = time.perf_counter()
+    page = Page(url, rank)
+    parser = TextExtractor()
+
+    async def Read():
+        async with HostLimit(urlsplit(url).netloc):
+            async with client.stream("GET", url, headers={"User-Agent": UserAgent}, follow_redirects=True) as response:
+                response.raise_for_status()
+                kind = response.headers.get("content-type", "text/html")
+                if "html" not in kind and not kind.startswith("text/"):
+                    raise ValueError(f"not a web page ({kind})")
+                decoder = codecs.getincrementaldecoder(response.charset_encoding or "utf-8")(errors="replace")
+                async for data in response.aiter_bytes():
+                    page.size += len(data)
+                    parser.feed(decoder.decode(data))
+                    if page.size >= max_bytes:
+                        Count(truncated=1)
+                        break
+                parser.feed(decoder.decode(b"", final=True))
+
+    try:
+        # The deadline covers waiting for the host, the request and every read, including a stalled body.
+        await asyncio.wait_for(Read(), max(0.0, deadline - loop.time()))
+    except asyncio.TimeoutError:
+        Count(late=1)
+        page.error = "TimeoutError: deadline reached"
+    except Exception as e:
+        page.error = f"{type(e).__name__}: {e}"
+    parser.close()  # Whatever arrived before an error or the deadline is still used.
+    page.title = " ".join(parser.title.split())
+    page.blocks = parser.blocks
+    page.ms = (time.perf_counter() - started) * 1000
+    Count(pages=1, failed=1 if page.error and not page.blocks else 0, bytes=page.size, seconds=page.ms / 1000)
+    return page
+
+
+async def FetchPages(urls, deadline=FetchDeadline, client=None):
+    """Download the pages at the same time; pages still loading at the deadline keep the text they have."""
+    if client is None:
+        from Backend.Providers import GetAsyncHttp  # Shared per-loop pool with keep-alive per host.
+        client = GetAsyncHttp()
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+    tasks = [asyncio.ensure_future(FetchPage(client, url, rank, end)) for rank, url in enumerate(urls)
+             if url.startswith(("http://", "https://"))]
+    if not tasks:
+        return []
+    return sorted(await asyncio.gather(*tasks), key=lambda page: page.rank)
+
+
+# ---------- Passages ----------
+
+def Terms(text):
+    return [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in Stopwords and len(word) > 1]
+
+
+def Passages(pages, words=PassageWords):
+    """Split each page's blocks into passages of about `words` words, merging short neighbours."""
+    passages = []
+    for page in pages:
+        current = []
+        for block in page.blocks:
+            tokens = block.split()
+            while tokens:
+                room = words - len(current)
+                current.extend(tokens[:room])
+                tokens = tokens[room:]
+                if len(current) >= words:
+                    passages.append((page, " ".join(current)))
+                    current = []
+        if current:
+            passages.append((page, " ".join(current)))
+    return passages
+
+
+def Rank(query, passages, k1=1.2, b=0.75):
+    """BM25 scores of the passages for the query, with a small preference for higher search results."""
+    query_terms = set(Terms(query))
+    documents = [Terms(text) for _, text in passages]
+    if not documents:
+        return []
+    average = sum(len(document) for document in documents) / len(documents) or 1
+    frequency = Counter(term for document in documents for term in set(document) if term in query_terms)
+    scores = []
+    for (page, text), document in zip(passages, documents):
+        counts = Counter(document)
+        score = 0.0
+        for term in query_terms:
+            tf = counts.get(term, 0)
+            if tf:
+                idf = math.log(1 + (len(documents) - frequency[term] + 0.5) / (frequency[term] + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(document) / average))
+        scores.append(score + 0.05 / (page.rank + 1))
+    return scores
+
+
+def PackPassages(query, pages, budget=PassageTokens):
+    """The most relevant passages, best first, that fit in the token budget, each with its source."""
+    passages = Passages(pages)
+    scores = Rank(query, passages)
+    packed = []
+    used = 0
+    seen = set()
+    for score, (page, text) in sorted(zip(scores, passages), key=lambda item: item[0], reverse=True):
+        key = text.lower()
+        if score <= 0.05 or key in seen:
+            continue  # No query term at all, or the same boilerplate on several pages.
+        entry = f"[{page.rank + 1}] {page.title or page.url}\n{text}"
+        cost = EstimateTokens(entry)
+        if used + cost > budget:
+            continue
+        seen.add(key)
+        packed.append(entry)
+        used += cost
+    return "\n\n".join(packed)
+
+
+async def PageContextAsync(query, urls, pages=None, deadline=FetchDeadline, budget=PassageTokens):
+    """Packed passages from the top result pages, or "" when fetching is off or nothing useful arrived."""
+    if not PageFetchEnabled or not urls:
+        return ""
+    with Span("PageFetch"):
+        fetched = await FetchPages(list(urls)[:pages or PageCount], deadline)
+    return PackPassages(query, fetched, budget)
+
+
+# ---------- Blocking callers ----------
+
+background_loop = None
+background_lock = threading.Lock()
+
+
+def BackgroundLoop():
+    """One event loop on a daemon thread, so blocking callers keep their connections between turns."""
+    global background_loop
+    with background_lock:
+        if background_loop is None:
+            background_loop = asyncio.new_event_loop()
+            threading.Thread(target=background_loop.run_forever, name="PageFetcher", daemon=True).start()
+        return background_loop
+
+
+def PageContext(query, urls, pages=None, deadline=FetchDeadline, budget=PassageTokens):
+    if not PageFetchEnabled or not urls:
+        return ""
+    future = asyncio.run_coroutine_threadsafe(PageContextAsync(query, urls, pages, deadline, budget), BackgroundLoop())
+    return future.result(deadline + 1)
+
+
+def FetchStats():
+    with stats_lock:
+        stats = dict(fetch_stats)
+    stats["seconds"] = round(stats["seconds"], 3)
+    stats["average_ms"] = round(stats["seconds"] * 1000 / stats["pages"], 1) if stats["pages"] else None
+    return stats
+
+
+# ---------- Fixture benchmark ----------
+
+def FixtureServer(pages=5, delay=0.3, paragraphs=40):
+    """Serve synthetic article pages on localhost, each taking `delay` seconds to start responding.
+
+    Every page gets its own port, so like real search results each one is on a different host.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    filler = "Readers often ask how the engine behaves under load and which settings matter most in practice."
+    body = ("<html><head><title>Fixture article {n}</title><script>var tracking = 'x'.repeat(1000);</script>"
+            "<style>p {{ color: black; }}</style></head><body><nav><a href='/'>Home</a> <a href='/about'>About us and more</a></nav>"
+            "<article><h1>Fixture article {n}</h1>{paragraphs}</article><footer>Copyright fixture site, all rights reserved forever.</footer></body></html>")
+
+    def Article(n):
+        lines = [f"<p>Paragraph {i} of article {n}. {filler} Topic {n} covers the python release schedule in detail.</p>"
+                 if i % 7 == n % 7 else f"<p>Paragraph {i} of article {n}. {filler}</p>" for i in range(paragraphs)]
+        return body.format(n=n, paragraphs="".join(lines)).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            data = Article(int(self.path.rsplit("/", 1)[-1] or 0))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            for start in range(0, len(data), 4096):
+                self.wfile.write(data[start:start + 4096])
+
+        def log_message(self, *args):
+            pass
+
+    servers = [ThreadingHTTPServer(("127.0.0.1", 0), Handler) for _ in range(pages)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/page/{n}" for n, server in enumerate(servers)]
+    return servers, urls
+
+
+def Benchmark(pages=5, delay=0.3, repeat=3, query="python release schedule"):
+    """Compare fetching the fixture pages one after another with fetching them concurrently."""
+    import httpx
+    servers, urls = FixtureServer(pages, delay)
+
+    async def Run():
+        async with httpx.AsyncClient() as client:
+            sequential, concurrent = [], []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fetched = [await FetchPage(client, url, rank, asyncio.get_running_loop().time() + 30) for rank, url in enumerate(urls)]
+                sequential.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                fetched = await FetchPages(urls, deadline=30, client=client)
+                concurrent.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            packed = PackPassages(query, fetched)
+            pack_ms = (time.perf_counter() - started) * 1000
+            return {
+                "pages": pages,
+                "server_delay_s": delay,
+                "sequential_ms": round(min(sequential) * 1000, 1),
+                "concurrent_ms": round(min(concurrent) * 1000, 1),
+                "speedup": round(min(sequential) / min(concurrent), 2),
+                "bytes": sum(page.size for page in fetched),
+                "blocks": sum(len(page.blocks) for page in fetched),
+                "pack_ms": round(pack_ms, 2),
+                "packed_tokens": EstimateTokens(packed) if packed else 0,
+                "packed_passages": packed.count("\n\n") + 1 if packed else 0,
+            }
+
+    try:
+        return asyncio.run(Run())
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark page fetching and passage packing against a local fixture server.")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.3, help="seconds the fixture server waits before each response")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(Benchmark(args.pages, args.delay, args.repeat), indent=4))
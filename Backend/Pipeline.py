@@ -0,0 +1,92 @@
+import contextvars  # Keeps the capture stage's turn ID when the query is executed.
+import queue  # Hands captured queries from the capture stage to the turn stage.
+import re  # Sentence boundary detection.
+import threading  # Each stage runs on its own thread.
+
+# A sentence ends at ., ! or ? followed by whitespace.
+SentenceEnd = re.compile(r'(?<=[.!?])\s+')
+
+
+def SplitSentences(chunks):
+    """Regroup a stream of text chunks into sentences, yielding each one as soon as it is complete."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        parts = SentenceEnd.split(buffer)
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                yield sentence.strip()
+        buffer = parts[-1]
+
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class TurnPipeline:
+    """Runs utterance capture and turn execution as separate stages joined by a queue.
+
+    The capture stage keeps listening while the previous answer is still being
+    generated; at most `backlog` captured queries wait for execution. With a speech
+    queue, capture pauses while an answer is playing and a query heard while the
+    assistant was speaking is dropped, so the microphone does not pick up its own
+    voice. on_idle(listening) is called once a turn has finished speaking and no
+    other query is waiting.
+    """
+
+    def __init__(self, capture, execute, wait_until_active, backlog=1, speech=None, on_idle=None):
+        self.capture = capture
+        self.execute = execute
+        self.wait_until_active = wait_until_active
+        self.queries = queue.Queue(maxsize=backlog)
+        self.speech = speech  # Has wait() and a count of clips `played`, like TextToSpeech.SpeechQueue.
+        self.on_idle = on_idle
+        self.lock = threading.Lock()
+        self.capturing = False
+
+    def start(self):
+        threading.Thread(target=self.capture_loop, daemon=True).start()
+        threading.Thread(target=self.execute_loop, daemon=True).start()
+
+    def played(self):
+        return self.speech.played if self.speech is not None else 0
+
+    def settle(self):
+        with self.lock:
+            if self.on_idle is not None and self.queries.empty():
+                self.on_idle(self.capturing)
+
+    def capture_loop(self):
+        while True:
+            self.wait_until_active()
+            if self.speech is not None:
+                self.speech.wait()
+            played = self.played()
+            with self.lock:
+                self.capturing = True
+            try:
+                query = self.capture()
+            except Exception as e:
+                print(f"[ERROR] Capture stage failed: {e}")
+                continue
+            finally:
+                with self.lock:
+                    self.capturing = False
+            if query and self.played() != played:
+                print(f"[INFO] Dropped '{query}': it was heard while the assistant was speaking.")
+                self.settle()
+                continue
+            if query:
+                self.queries.put((query, contextvars.copy_context()))
+
+    def execute_loop(self):
+        while True:
+            query, context = self.queries.get()
+            try:
+                context.run(self.execute, query)
+            except Exception as e:
+                print(f"[ERROR] Turn failed for '{query}': {e}")
+            if self.queries.empty():
+                # Capture is paused while the answer plays, so nothing new can arrive meanwhile.
+                if self.speech is not None:
+                    self.speech.wait()
+                self.settle()
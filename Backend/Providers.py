@@ -0,0 +1,124 @@
+import asyncio  # Async clients are kept per event loop.
+import threading  # Client creation happens from several threads.
+import weakref  # Async clients go away with their event loop.
+import httpx  # Pooled keep-alive HTTP transport shared by every provider SDK.
+from dotenv import dotenv_values  # Keys and timeouts come from .env.
+from Backend.Tracing import Span  # Connection warmup timing.
+
+try:
+    import h2  # noqa: F401  Optional (see Requirements.txt): enables HTTP/2 where the provider supports it.
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# One provider layer for every LLM call: the Groq and Cohere SDKs and the raw HTTP calls all
+# share pooled keep-alive connections, so TLS handshakes happen once instead of on every turn.
+# Groq retries are left to Backend.Resilience, which also tracks the provider's health.
+
+env_vars = dotenv_values(".env")
+GroqAPIKey = env_vars.get("GroqAPIKey")
+CohereAPIKey = env_vars.get("CohereAPIKey")
+
+# Seconds to wait for a connection and for the response; a single call can override them.
+ConnectTimeout = float(env_vars.get("LLMConnectTimeout", 5))
+ReadTimeout = float(env_vars.get("LLMReadTimeout", 60))
+
+# Hosts contacted at startup so the first turn finds a warm connection.
+WarmHosts = ["https://api.groq.com", "https://api.cohere.com"]
+
+Limits = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120)
+
+
+def DefaultTimeout(read=None):
+    return httpx.Timeout(read or ReadTimeout, connect=ConnectTimeout)
+
+
+lock = threading.Lock()
+http_client = None
+groq_client = None
+cohere_client = None
+async_clients = weakref.WeakKeyDictionary()  # event loop -> {"http", "groq", "cohere"}
+
+
+def HttpClient():
+    """The shared synchronous connection pool."""
+    global http_client
+    with lock:
+        if http_client is None:
+            http_client = httpx.Client(http2=HTTP2, limits=Limits, timeout=DefaultTimeout())
+        return http_client
+
+
+def GetGroq(timeout=None):
+    """Groq client on the shared pool; pass timeout (seconds) to override it for the calls made with it."""
+    global groq_client
+    from groq import Groq
+    http = HttpClient()
+    with lock:
+        if groq_client is None:
+            groq_client = Groq(api_key=GroqAPIKey, http_client=http, timeout=DefaultTimeout(), max_retries=0)
+        client = groq_client
+    return client.with_options(timeout=DefaultTimeout(timeout)) if timeout else client
+
+
+def GetCohere():
+    """Cohere client on the shared pool; per-call timeouts go in request_options={"timeout_in_seconds": n}."""
+    global cohere_client
+    import cohere
+    http = HttpClient()
+    with lock:
+        if cohere_client is None:
+            cohere_client = cohere.Client(api_key=CohereAPIKey, httpx_client=http, timeout=ReadTimeout)
+        return cohere_client
+
+
+def AsyncClients():
+    """Async clients for the running event loop; an httpx.AsyncClient cannot be shared between loops."""
+    loop = asyncio.get_running_loop()
+    with lock:
+        clients = async_clients.get(loop)
+        if clients is None:
+            clients = async_clients[loop] = {
+                "http": httpx.AsyncClient(http2=HTTP2, limits=Limits, timeout=DefaultTimeout())
+            }
+        return clients
+
+
+def GetAsyncHttp():
+    return AsyncClients()["http"]
+
+
+def GetAsyncGroq(timeout=None):
+    from groq import AsyncGroq
+    clients = AsyncClients()
+    if "groq" not in clients:
+        clients["groq"] = AsyncGroq(api_key=GroqAPIKey, http_client=clients["http"], timeout=DefaultTimeout(), max_retries=0)
+    client = clients["groq"]
+    return client.with_options(timeout=DefaultTimeout(timeout)) if timeout else client
+
+
+def GetAsyncCohere():
+    import cohere
+    clients = AsyncClients()
+    if "cohere" not in clients:
+        clients["cohere"] = cohere.AsyncClient(api_key=CohereAPIKey, httpx_client=clients["http"], timeout=ReadTimeout)
+    return clients["cohere"]
+
+
+def WarmConnections():
+    """Open (and keep alive) a connection to every provider host so no turn pays for the TLS handshake."""
+    client = HttpClient()
+    for host in WarmHosts:
+        try:
+            with Span("WarmConnection"):
+                client.head(host, timeout=DefaultTimeout(10))
+        except httpx.HTTPError as e:
+            print(f"[WARNING] Could not pre-connect to {host}: {e}")
+
+
+def CloseClients():
+    global http_client, groq_client, cohere_client
+    with lock:
+        if http_client is not None:
+            http_client.close()
+        http_client = groq_client = cohere_client = None
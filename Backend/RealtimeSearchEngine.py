@@ -1,8 +1,13 @@
-from googlesearch import search
-from groq import Groq  # Importing the Groq library to use its API.
-from json import load, dump  # Functions to read and write JSON files.
+from Backend.WebSearch import web_search  # Cached, deduplicated web search.
+from Backend.PageFetcher import PageContext, PageContextAsync  # Relevant passages from the result pages.
+from Backend.Providers import GetGroq, GetAsyncGroq  # Shared pooled Groq clients.
+from Backend.ChatLogStore import chat_log  # Append-only conversation history.
+from Backend.ContextWindow import context_window  # Token-budgeted history with a rolling summary.
 import datetime  # Module for real-time date and time information.
 from dotenv import dotenv_values  # To read environment variables from a .env file.
+from Backend.Tracing import Traced  # Per-stage latency spans.
+from Backend.Resilience import Call, CallAsync, Stream, DegradedAnswer  # Retries, backoff and the provider circuit breaker.
+import asyncio  # Deadlines for the async API.
 
 # Load environment variables from the .env file.
 env_vars = dotenv_values(".env")
@@ -12,32 +17,66 @@ Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
-# Initialize the Groq client with the provided API key.
-client = Groq(api_key=GroqAPIKey)
+# The shared Groq client is fetched on first use so importing this module stays cheap.
+client = None
+
+def GetClient():
+    global client
+    if client is None:
+        client = GetGroq()
+    return client
 
 # Define the system instructions for the chatbot.
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which has real-time up-to-date information from the internet.
 *** Provide Answers In a Professional Way, make sure to add full stops, commas, question marks, and use proper grammar.***
 *** Just answer the question from the provided data in a professional way. ***"""
 
-# Try to load the chat log from a JSON file, or create an empty one if it doesn't exist.
-try:
-    with open(rf"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-except FileNotFoundError:
-    with open(rf"Data\ChatLog.json", "w") as f:
-        dump([], f)
-    messages = []
-
-# Function to perform a Google search and format the results.
-def GoogleSearch(query):
-    results = list(search(query, num_results=5))
+# Function to format search results (and passages from the result pages) for the prompt.
+def SearchResults(query, results, passages=""):
     Answer = f"The search results for '{query}' are:\n[start]\n"
     for i in results:
         Answer += f"{i}\n\n"
     Answer += "[end]"
+    if passages:
+        Answer += f"\nRelevant passages from these pages:\n[start]\n{passages}\n[end]"
     return Answer
 
+# Function to perform a Google search and format the results.
+@Traced("GoogleSearch")
+def GoogleSearch(query):
+    try:
+        results = web_search.search(query, 5)
+    except Exception as e:
+        # Answer from the model alone rather than not at all.
+        print(f"Search failed: {e}")
+        return f"No search results for '{query}' are available right now."
+    passages = web_search.passages(query, 5)
+    if passages is None:
+        try:
+            passages = PageContext(query, results)
+        except Exception as e:
+            print(f"Page fetch failed: {e}")
+            passages = ""
+        web_search.keep_passages(query, 5, passages)
+    return SearchResults(query, results, passages)
+
+@Traced("GoogleSearch")
+async def GoogleSearchAsync(query):
+    try:
+        results = await web_search.search_async(query, 5)
+    except Exception as e:
+        print(f"Search failed: {e}")
+        return f"No search results for '{query}' are available right now."
+    passages = web_search.passages(query, 5)
+    if passages is None:
+        try:
+            passages = await PageContextAsync(query, results)
+        except Exception as e:
+            print(f"Page fetch failed: {e}")
+            passages = ""
+        web_search.keep_passages(query, 5, passages)
+    return SearchResults(query, results, passages)
+
 # Function to clean up the answer by removing empty lines.
 def AnswerModifier(Answer): 
     lines = Answer.split('\n')
@@ -71,41 +110,122 @@ def Information():
     return data
 
 # Function to handle real-time search and response generation.
+@Traced("RealtimeSearchEngine")
 def RealtimeSearchEngine(prompt):
-    global SystemChatBot, messages
+    messages = chat_log.messages()
+
+    messages.append({"role": "user", "content": prompt})
+
+    # Add Google search result as a system message (a per-request copy, so a failure leaves nothing behind).
+    Instructions = SystemChatBot + [{"role": "system", "content": GoogleSearch(prompt)}]
+
+    def Generate():
+        completion = GetClient().chat.completions.create(
+            model="llama3-70b-8192",
+            messages=Instructions + [{"role": "system", "content": Information()}] + context_window.fit(messages),
+            temperature=0.7,
+            max_tokens=2048,
+            top_p=1,
+            stream=True,
+            stop=None
+        )
+
+        Answer = ""
 
-    with open(rf"Data\ChatLog.json", "r") as f:
-        messages = load(f)
+        for chunk in completion:
+            if chunk.choices[0].delta.content:
+                Answer += chunk.choices[0].delta.content
+        return Answer
 
+    try:
+        Answer = Call("groq", Generate).strip().replace("</s>", "")
+    except Exception as e:
+        print(f"Error: {e}")
+        return DegradedAnswer("groq")
+
+    chat_log.append(messages[-1], {"role": "assistant", "content": Answer})
+
+    return AnswerModifier(Answer)
+
+# Async counterpart of RealtimeSearchEngine: many can run on one event loop without a thread per request.
+@Traced("RealtimeSearchEngine")
+async def RealtimeSearchEngineAsync(prompt, deadline=None):
+    """Await a search-grounded answer; deadline (seconds) bounds the search and the model call together."""
+    messages = chat_log.messages()
     messages.append({"role": "user", "content": prompt})
 
-    # Add Google search result as a system message.
-    SystemChatBot.append({"role": "system", "content": GoogleSearch(prompt)})
+    async def Respond():
+        # Cached results come straight back; the blocking search library runs on the default executor.
+        results = await GoogleSearchAsync(prompt)
+        Instructions = SystemChatBot + [{"role": "system", "content": results}, {"role": "system", "content": Information()}]
+
+        async def Generate():
+            completion = await GetAsyncGroq(timeout=deadline).chat.completions.create(
+                model="llama3-70b-8192",
+                messages=Instructions + context_window.fit(messages),
+                temperature=0.7,
+                max_tokens=2048,
+                top_p=1,
+                stream=True,
+                stop=None
+            )
+            Answer = ""
+            try:
+                async for chunk in completion:
+                    if chunk.choices[0].delta.content:
+                        Answer += chunk.choices[0].delta.content
+            finally:
+                await completion.close()  # Also runs on cancellation, so the connection goes back to the pool.
+            return Answer
+
+        return await CallAsync("groq", Generate)
+
+    try:
+        Answer = (await asyncio.wait_for(Respond(), deadline)).strip().replace("</s>", "")
+    except Exception as e:
+        # Includes the deadline expiring; the chat log is kept.
+        print(f"Error: {e!r}")
+        return DegradedAnswer("groq")
+
+    chat_log.append(messages[-1], {"role": "assistant", "content": Answer})
+    return AnswerModifier(Answer)
+
+# Streaming variant of RealtimeSearchEngine that yields the answer piece by piece as it is generated.
+@Traced("RealtimeSearchEngine")
+def RealtimeSearchEngineStream(prompt):
+    messages = chat_log.messages()
+    messages.append({"role": "user", "content": prompt})
 
-    completion = client.chat.completions.create(
+    # The search results go into a per-request copy, so concurrent requests do not see each other's.
+    Instructions = SystemChatBot + [{"role": "system", "content": GoogleSearch(prompt)}, {"role": "system", "content": Information()}]
+    completion = Stream("groq", lambda: GetClient().chat.completions.create(
         model="llama3-70b-8192",
-        messages=SystemChatBot + [{"role": "system", "content": Information()}] + messages,
+        messages=Instructions + context_window.fit(messages),
         temperature=0.7,
         max_tokens=2048,
         top_p=1,
         stream=True,
         stop=None
-    )
+    ))
 
     Answer = ""
-
-    for chunk in completion:
-        if chunk.choices[0].delta.content:
-            Answer += chunk.choices[0].delta.content
-
-    Answer = Answer.strip().replace("</s>", "")
-    messages.append({"role": "assistant", "content": Answer})
-
-    with open(rf"Data\ChatLog.json", "w") as f:
-        dump(messages, f, indent=4)
-
-    SystemChatBot.pop()
-    return AnswerModifier(Answer)
+    try:
+        for chunk in completion:
+            content = chunk.choices[0].delta.content
+            if content:
+                content = content.replace("</s>", "")
+                if not Answer:
+                    content = content.lstrip()
+                Answer += content
+                yield content
+    except Exception as e:
+        # A partial answer has already been shown and is left unsaved.
+        print(f"Error: {e}")
+        if not Answer:
+            yield DegradedAnswer("groq")
+        return
+
+    chat_log.append(messages[-1], {"role": "assistant", "content": Answer.strip()})
 
 # Main entry point for user interaction.
 if __name__ == "__main__":
@@ -0,0 +1,410 @@
+import argparse  # Command line for the replay runner.
+import json  # Recordings are stored as JSON lines.
+import os  # Working directory and paths.
+import shutil  # Seeds the replay chat log.
+import sys  # Installs stand-in modules.
+import tempfile  # Replays run in a throwaway working directory.
+import threading  # Protects the recording buffers.
+import time  # Inter-chunk timing.
+import types  # Builds the stand-in modules.
+from contextlib import contextmanager  # Turn recording context.
+
+from Backend.Tracing import CurrentTurn, BeginTurn, Histogram, tracer
+from Backend.ConversationBuffer import BufferStats
+
+# Record real turns (query, DMM decision, LLM token streams, search results) and replay
+# them through Main.ExecuteQuery with local stand-ins for Cohere, Groq, googlesearch,
+# edge-tts and SMTP, so orchestration overhead can be measured without a network.
+#
+#   Recording:  set RecordTurns=Data/Recordings/turns.jsonl in .env and use the assistant.
+#   Replaying:  python -m Backend.Replay Data/Recordings/turns.jsonl --speed 0 --repeat 5
+
+
+# ---------- Recording ----------
+
+class Recorder:
+    """Collects backend traffic per turn and appends one JSON line per finished turn."""
+
+    def __init__(self, path):
+        self.path = path
+        self.turns = {}
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def current(self):
+        return self.turns.get(CurrentTurn.get())
+
+    def add(self, key, value):
+        with self.lock:
+            record = self.current()
+            if record is not None:
+                record.setdefault(key, []).append(value)
+
+    def set(self, key, value):
+        with self.lock:
+            record = self.current()
+            if record is not None:
+                record[key] = value
+
+    @contextmanager
+    def turn(self, query):
+        turn_id = CurrentTurn.get() or BeginTurn()
+        record = {"query": query, "started": time.time()}
+        start = time.perf_counter()
+        with self.lock:
+            self.turns[turn_id] = record
+        try:
+            yield record
+        finally:
+            record["duration"] = round(time.perf_counter() - start, 6)
+            with self.lock:
+                self.turns.pop(turn_id, None)
+                with open(self.path, "a", encoding='utf-8') as file:
+                    file.write(json.dumps(record) + "\n")
+
+
+def TimedChunks(chunks, text_of):
+    """Yield chunks unchanged while collecting [seconds since previous chunk, text] pairs."""
+    recorded = []
+    last = time.perf_counter()
+
+    def Iterate():
+        nonlocal last
+        for chunk in chunks:
+            now = time.perf_counter()
+            text = text_of(chunk)
+            if text:
+                recorded.append([round(now - last, 6), text])
+                last = now
+            yield chunk
+
+    return Iterate(), recorded
+
+
+class RecordingCohere:
+    def __init__(self, client, recorder):
+        self.client = client
+        self.recorder = recorder
+
+    def chat_stream(self, **kwargs):
+        def TextOf(event):
+            return event.text if event.event_type == "text-generation" else None
+
+        events, recorded = TimedChunks(self.client.chat_stream(**kwargs), TextOf)
+        yield from events
+        self.recorder.add("cohere", {"message": kwargs.get("message"), "events": recorded})
+
+
+class RecordingGroq:
+    def __init__(self, client, recorder):
+        self.client = client
+        self.recorder = recorder
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        completion = self.client.chat.completions.create(**kwargs)
+        if not kwargs.get("stream"):
+            return completion
+        return self.stream(completion, LastUserMessage(kwargs.get("messages", [])))
+
+    def stream(self, completion, prompt):
+        chunks, recorded = TimedChunks(completion, lambda chunk: chunk.choices[0].delta.content)
+        yield from chunks
+        self.recorder.add("groq", {"prompt": prompt, "chunks": recorded})
+
+
+def LastUserMessage(messages):
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message.get("content")
+    return None
+
+
+def StartRecording(path):
+    """Wrap the live backends so every turn run inside recorder.turn() is written to path."""
+    import Backend.Model as Model
+    import Backend.Chatbot as Chatbot
+    import Backend.RealtimeSearchEngine as RealtimeSearchEngine
+
+    recorder = Recorder(path)
+    Model.CO = RecordingCohere(Model.GetClient(), recorder)
+    Chatbot.client = RecordingGroq(Chatbot.GetClient(), recorder)
+    RealtimeSearchEngine.client = RecordingGroq(RealtimeSearchEngine.GetClient(), recorder)
+
+    backend = RealtimeSearchEngine.web_search.backend
+
+    def RecordingSearch(query, count):
+        results = list(backend.search(query, count))
+        recorder.add("search", {"query": query, "results": results})
+        return results
+
+    RealtimeSearchEngine.web_search.backend = types.SimpleNamespace(name=backend.name, search=RecordingSearch)
+    # A cached search would leave the turn without the results the replay needs.
+    RealtimeSearchEngine.web_search.capacity = 0
+
+    decide = Model.FirstLayerDMMStream
+
+    def RecordingFirstLayerDMMStream(*args, **kwargs):
+        decision = []
+        for task in decide(*args, **kwargs):
+            decision.append(task)
+            yield task
+        recorder.set("decision", decision)
+
+    Model.FirstLayerDMMStream = RecordingFirstLayerDMMStream
+    # A cached decision would leave the turn without the Cohere reply the replay needs.
+    Model.decision_cache = Model.DecisionCache(Model.DecisionCacheFile, capacity=0)
+    print(f"[INFO] Recording turns to {path}")
+    return recorder
+
+
+# ---------- Replay stand-ins ----------
+
+class StandIns:
+    """Local replacements for every network backend, fed from a recording."""
+
+    def __init__(self, speed=1.0):
+        self.speed = speed  # 1.0 replays at recorded speed, 0 as fast as possible.
+        self.cohere = {}
+        self.groq = {}
+        self.search = {}
+        self.spoken = []
+        self.actions = []
+        self.lock = threading.Lock()
+
+    def load_turn(self, turn):
+        with self.lock:
+            for entry in turn.get("cohere", []):
+                self.cohere.setdefault(entry["message"], []).append(entry["events"])
+            for entry in turn.get("groq", []):
+                self.groq.setdefault(entry["prompt"], []).append(entry["chunks"])
+            for entry in turn.get("search", []):
+                self.search[entry["query"]] = entry["results"]
+
+    def take(self, table, key):
+        with self.lock:
+            streams = table.get(key)
+            if not streams:
+                return None
+            return streams.pop(0) if len(streams) > 1 else streams[0]
+
+    def play(self, chunks):
+        for delay, text in chunks:
+            if self.speed:
+                time.sleep(delay / self.speed)
+            yield text
+
+    # --- cohere ---
+    def cohere_chat_stream(self, message=None, **kwargs):
+        events = self.take(self.cohere, message) or [[0.0, f"general {message}"]]
+        for text in self.play(events):
+            yield types.SimpleNamespace(event_type="text-generation", text=text)
+
+    # --- groq ---
+    def groq_create(self, messages=None, stream=False, **kwargs):
+        chunks = self.take(self.groq, LastUserMessage(messages or [])) or [[0.0, "This is a replayed answer."]]
+
+        def Chunk(text):
+            return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text))])
+
+        if stream:
+            return (Chunk(text) for text in self.play(chunks))
+        text = "".join(self.play(chunks))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=text))])
+
+    # --- googlesearch ---
+    def google_search(self, query, num_results=5, **kwargs):
+        return list(self.search.get(query, []))[:num_results]
+
+    # --- output side effects ---
+    def speak(self, text, *args, **kwargs):
+        with self.lock:
+            self.spoken.append(str(text))
+        return True
+
+    def action(self, name):
+        def Record(*args, **kwargs):
+            with self.lock:
+                self.actions.append((name, args))
+            return True
+        return Record
+
+    def modules(self):
+        """Build the stand-in modules that replace the network client libraries."""
+        stand_ins = self
+
+        cohere = types.ModuleType("cohere")
+        cohere.Client = lambda *args, **kwargs: types.SimpleNamespace(chat_stream=stand_ins.cohere_chat_stream)
+
+        groq = types.ModuleType("groq")
+
+        def GroqClient(*args, **kwargs):
+            return types.SimpleNamespace(chat=types.SimpleNamespace(
+                completions=types.SimpleNamespace(create=stand_ins.groq_create)))
+
+        groq.Groq = GroqClient
+
+        googlesearch = types.ModuleType("googlesearch")
+        googlesearch.search = stand_ins.google_search
+
+        edge_tts = types.ModuleType("edge_tts")
+
+        class Communicate:
+            def __init__(self, text, *args, **kwargs):
+                self.text = text
+
+            async def save(self, path):
+                stand_ins.speak(self.text)
+                with open(path, "wb"):
+                    pass
+
+        edge_tts.Communicate = Communicate
+
+        smtplib = types.ModuleType("smtplib")
+
+        class SMTP:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def login(self, *args, **kwargs):
+                pass
+
+            def starttls(self, *args, **kwargs):
+                pass
+
+            def send_message(self, *args, **kwargs):
+                stand_ins.action("send_message")()
+
+        smtplib.SMTP = smtplib.SMTP_SSL = SMTP
+        smtplib.SMTPException = Exception
+        smtplib.SMTPAuthenticationError = Exception
+
+        return {"cohere": cohere, "groq": groq, "googlesearch": googlesearch, "edge_tts": edge_tts, "smtplib": smtplib}
+
+    def install(self):
+        sys.modules.update(self.modules())
+
+
+def LoadRecording(path):
+    with open(path, "r", encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def PrepareWorkdir(chatlog=None):
+    """Create a throwaway working directory with its own chat log so replays never touch Data/."""
+    workdir = tempfile.mkdtemp(prefix="replay-")
+    os.makedirs(os.path.join(workdir, "Data"), exist_ok=True)
+    os.makedirs(os.path.join(workdir, "Frontend", "Files"), exist_ok=True)
+    target = os.path.join(workdir, rf"Data\ChatLog.json")
+    if chatlog and os.path.exists(chatlog):
+        # Either an old ChatLog.json (migrated on first use) or a ChatLog.jsonl store.
+        shutil.copyfile(chatlog, target + "l" if chatlog.endswith(".jsonl") else target)
+    else:
+        with open(target, "w", encoding='utf-8') as file:
+            file.write("[]")
+    return workdir
+
+
+def Replay(path, speed=1.0, repeat=1, chatlog=None):
+    """Replay every recorded turn through Main.ExecuteQuery and return latency and throughput numbers."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+    turns = LoadRecording(os.path.abspath(path))
+    stand_ins = StandIns(speed)
+    stand_ins.install()
+
+    previous = os.getcwd()
+    os.chdir(PrepareWorkdir(chatlog and os.path.abspath(chatlog)))
+    try:
+        import Main
+        Main.PipelinedTurns = False
+        Main.TextToSpeech = stand_ins.speak
+        Main.SpeechSink = stand_ins.speak  # Streamed answers are collected instead of played.
+        import Backend.PageFetcher as PageFetcher
+        PageFetcher.PageFetchEnabled = False  # Result pages are not recorded; the replay stays offline.
+        Main.StartImageGeneration = stand_ins.action("StartImageGeneration")
+        Main.SetAlarm = stand_ins.action("SetAlarm")
+        Main.send_email = stand_ins.action("send_email")
+        Main.send_email_with_manual_input = stand_ins.action("send_email_with_manual_input")
+
+        async def Automation(commands):
+            stand_ins.action("Automation")(commands)
+            return True
+
+        Main.Automation = Automation
+
+        # Every pass measures the recorded orchestration: nothing is answered from a cache filled by
+        # an earlier turn, and the replay neither logs decisions nor trains the intent model.
+        import Backend.Model as Model
+        import Backend.Chatbot as Chatbot
+        import Backend.RealtimeSearchEngine as RealtimeSearchEngine
+        Model.decision_cache = Model.DecisionCache(Model.DecisionCacheFile, capacity=0)
+        Model.IntentModelEnabled = False
+        Model.intent_model.learn = lambda query, decision: None
+        Chatbot.AnswerCacheEnabled = False
+        RealtimeSearchEngine.web_search.capacity = 0
+        RealtimeSearchEngine.web_search.clear()
+
+        tracer.reset()
+        latencies = Histogram(window=max(1, len(turns) * repeat))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for turn in turns:
+                stand_ins.load_turn(turn)
+                BeginTurn()
+                turn_start = time.perf_counter()
+                try:
+                    Main.ExecuteQuery(turn["query"])
+                except Exception as e:
+                    print(f"[ERROR] Replay of '{turn['query']}' failed: {e}")
+                    latencies.add(time.perf_counter() - turn_start, ok=False)
+                    continue
+                latencies.add(time.perf_counter() - turn_start)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.chdir(previous)
+
+    return {
+        "turns": latencies.count,
+        "speed": speed,
+        "elapsed_s": round(elapsed, 4),
+        "turns_per_s": round(latencies.count / elapsed, 2) if elapsed else None,
+        "turn_latency": latencies.summary(),
+        "stages": tracer.snapshot()["stages"],
+        "fast_path": sys.modules["Backend.Model"].FastPathStats() if "Backend.Model" in sys.modules else None,
+        "decision_cache": sys.modules["Backend.Model"].DecisionCacheStats() if "Backend.Model" in sys.modules else None,
+        "intent_model": sys.modules["Backend.Model"].IntentModelStats() if "Backend.Model" in sys.modules else None,
+        "answer_cache": sys.modules["Backend.AnswerCache"].AnswerCacheStats() if "Backend.AnswerCache" in sys.modules else None,
+        "providers": sys.modules["Backend.Resilience"].ResilienceStats() if "Backend.Resilience" in sys.modules else None,
+        "search": sys.modules["Backend.WebSearch"].SearchStats() if "Backend.WebSearch" in sys.modules else None,
+        "page_fetch": sys.modules["Backend.PageFetcher"].FetchStats() if "Backend.PageFetcher" in sys.modules else None,
+        "speculation": sys.modules["Backend.Chatbot"].SpeculationStats() if "Backend.Chatbot" in sys.modules else None,
+        "buffers": BufferStats(),
+        "chat_log": sys.modules["Backend.ChatLogStore"].chat_log.stats() if "Backend.ChatLogStore" in sys.modules else None,
+        "spoken": len(stand_ins.spoken),
+        "actions": len(stand_ins.actions),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded turns against local stand-ins for the network backends.")
+    parser.add_argument("recording", help="JSON lines file written with RecordTurns")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded speed, 0 = as fast as possible")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the recording this many times")
+    parser.add_argument("--chatlog", default=None, help="ChatLog.json or ChatLog.jsonl to start from (default: empty)")
+    parser.add_argument("--output", default=None, help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = json.dumps(Replay(args.recording, args.speed, args.repeat, args.chatlog), indent=4)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding='utf-8') as file:
+            file.write(report)
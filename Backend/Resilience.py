@@ -0,0 +1,258 @@
+import asyncio  # Async calls back off without blocking the event loop.
+import random  # Jitter for retry delays.
+import threading  # Breakers are shared by every intent thread.
+import time  # Backoff sleeps and breaker cooldowns.
+from dotenv import dotenv_values  # Retry and breaker settings come from .env.
+from Backend.Tracing import Span  # Backoff waits show up in the trace.
+
+env_vars = dotenv_values(".env")
+
+# Every LLM call goes through here: transient failures are retried a few times with jittered
+# exponential backoff, and a provider that keeps failing is skipped for a cooldown period so
+# an outage costs one fast "degraded" answer per turn instead of a stack of stuck requests.
+
+Retries = int(env_vars.get("LLMRetries", 2))  # Extra attempts after the first one.
+BackoffBase = float(env_vars.get("LLMBackoff", 0.5))
+BackoffMax = float(env_vars.get("LLMBackoffMax", 8))
+BreakerFailures = int(env_vars.get("BreakerFailures", 5))  # Consecutive failures that open the circuit.
+BreakerCooldown = float(env_vars.get("BreakerCooldown", 30))  # Seconds before a trial call is let through.
+
+TransientStatus = {408, 409, 429}
+
+# What the user hears when a provider cannot answer.
+DegradedMessages = {
+    "groq": "Sorry, I can't reach my language service right now. Please try again in a moment.",
+    "google": "Sorry, I can't reach the search service right now. Please try again in a moment.",
+}
+
+
+class ProviderUnavailable(Exception):
+    """The provider's circuit is open, or every attempt failed."""
+
+    def __init__(self, provider, message):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+
+
+def StatusOf(error):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def Retryable(error):
+    """Timeouts, connection errors, rate limits and 5xx responses are worth another attempt."""
+    status = StatusOf(error)
+    if status is not None:
+        return status in TransientStatus or status >= 500
+    while error is not None:
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            return True
+        name = type(error).__name__
+        if "Timeout" in name or "Connect" in name or name in ("RemoteProtocolError", "ReadError", "WriteError"):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def Delay(attempt, error=None):
+    """Full-jitter exponential backoff, stretched to the server's Retry-After when it sends one."""
+    delay = random.uniform(0, min(BackoffMax, BackoffBase * 2 ** attempt))
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        delay = max(delay, min(BackoffMax, float(headers.get("retry-after", 0))))
+    except (TypeError, ValueError):
+        pass
+    return delay
+
+
+class CircuitBreaker:
+    """Per-provider breaker: closed, open after repeated failures, half-open for one trial call."""
+
+    def __init__(self, name, failures=BreakerFailures, cooldown=BreakerCooldown):
+        self.name = name
+        self.failures = failures
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.state = "closed"
+        self.consecutive = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.counts = {"calls": 0, "successes": 0, "errors": 0, "retries": 0, "rejected": 0, "trips": 0, "degraded": 0}
+
+    def allow(self):
+        with self.lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    self.counts["rejected"] += 1
+                    return False
+                self.state = "half-open"
+            if self.state == "half-open":
+                if self.probing:
+                    self.counts["rejected"] += 1
+                    return False
+                self.probing = True
+            self.counts["calls"] += 1
+            return True
+
+    def success(self):
+        with self.lock:
+            self.counts["successes"] += 1
+            self.state = "closed"
+            self.consecutive = 0
+            self.probing = False
+
+    def failure(self, transient=True):
+        """Record a failed attempt; only transient failures count towards opening the circuit."""
+        with self.lock:
+            self.counts["errors"] += 1
+            self.probing = False
+            if not transient:
+                if self.state == "half-open":
+                    self.state = "closed"  # The provider answered, just not with success.
+                return
+            self.consecutive += 1
+            if self.state == "half-open" or self.consecutive >= self.failures:
+                if self.state != "open":
+                    self.counts["trips"] += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """Forget an attempt that was abandoned (cancelled) without an outcome."""
+        with self.lock:
+            self.probing = False
+
+    def retried(self):
+        with self.lock:
+            self.counts["retries"] += 1
+
+    def degraded(self):
+        with self.lock:
+            self.counts["degraded"] += 1
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counts)
+            stats["state"] = self.state
+            stats["consecutive_failures"] = self.consecutive
+            stats["error_rate"] = round(stats["errors"] / stats["calls"], 4) if stats["calls"] else None
+            if self.state == "open":
+                stats["retry_in"] = round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1)
+            return stats
+
+
+breakers = {}
+breakers_lock = threading.Lock()
+
+
+def Breaker(provider):
+    with breakers_lock:
+        if provider not in breakers:
+            breakers[provider] = CircuitBreaker(provider)
+        return breakers[provider]
+
+
+def Attempts(provider, retries):
+    """Yield attempt numbers while the breaker allows them; raise once it does not."""
+    breaker = Breaker(provider)
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            raise ProviderUnavailable(provider, "circuit open")
+        yield attempt
+
+
+def Backoff(provider, error, attempt, retries):
+    """Record a failed attempt and return how long to wait before the next one, or raise."""
+    breaker = Breaker(provider)
+    transient = Retryable(error)
+    breaker.failure(transient)
+    if not transient:
+        raise error
+    if attempt >= retries:
+        raise ProviderUnavailable(provider, f"giving up after {attempt + 1} attempts: {error}") from error
+    breaker.retried()
+    return Delay(attempt, error)
+
+
+def Failed(provider, error, attempt, retries):
+    delay = Backoff(provider, error, attempt, retries)
+    with Span("Backoff"):
+        time.sleep(delay)
+
+
+def Call(provider, function, *args, retries=None, **kwargs):
+    """Run function(*args, **kwargs) with retries and the provider's circuit breaker."""
+    retries = Retries if retries is None else retries
+    for attempt in Attempts(provider, retries):
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            Failed(provider, e, attempt, retries)
+            continue
+        Breaker(provider).success()
+        return result
+
+
+async def CallAsync(provider, function, *args, retries=None, **kwargs):
+    """Await function(*args, **kwargs) with retries and the provider's circuit breaker.
+
+    Cancelling the awaiting task stops it at once, including during a backoff wait, and is not
+    counted as a provider failure.
+    """
+    retries = Retries if retries is None else retries
+    for attempt in Attempts(provider, retries):
+        try:
+            result = await function(*args, **kwargs)
+        except asyncio.CancelledError:
+            Breaker(provider).release()
+            raise
+        except Exception as e:
+            delay = Backoff(provider, e, attempt, retries)
+            with Span("Backoff"):
+                await asyncio.sleep(delay)
+            continue
+        Breaker(provider).success()
+        return result
+
+
+def Stream(provider, create, retries=None):
+    """Iterate a streaming call made by create().
+
+    The call is retried until its first item arrives, which counts as a success; a later failure
+    is recorded and re-raised, since the caller has already used part of the answer.
+    """
+    retries = Retries if retries is None else retries
+    for attempt in Attempts(provider, retries):
+        try:
+            iterator = iter(create())
+            first = next(iterator)
+        except StopIteration:
+            Breaker(provider).success()
+            return
+        except Exception as e:
+            Failed(provider, e, attempt, retries)
+            continue
+        break
+
+    Breaker(provider).success()  # The provider is answering; a later error is recorded separately.
+    yield first
+    try:
+        for item in iterator:
+            yield item
+    except Exception as e:
+        Breaker(provider).failure(Retryable(e))
+        raise
+
+
+def DegradedAnswer(provider="groq"):
+    """The message spoken in place of an answer the provider could not give."""
+    Breaker(provider).degraded()
+    return DegradedMessages.get(provider, "Sorry, that service is unavailable right now. Please try again in a moment.")
+
+
+def ResilienceStats():
+    with breakers_lock:
+        providers = list(breakers.items())
+    return {name: breaker.stats() for name, breaker in providers}
@@ -4,6 +4,8 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import dotenv_values
+from Backend.Tracing import Traced
+from Backend.EventBus import bus, STATUS
 import os
 import mtranslate as mt
 
@@ -72,16 +74,20 @@ chrome_options.add_argument("-use-fake-ui-for-media-stream")
 chrome_options.add_argument("-use-fake-device-for-media-stream")
 #chrome_options.add_argument("-headless=new")
 
-# Initialize the Chrome webDriver using the ChromeDriverManager
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service, options=chrome_options)
+# The Chrome webDriver is started on first use (or by the startup warmup), not at import.
+driver = None
 
-TempDirPath = rf"{current_dir}/Frontend/Files"
+# Function to initialize the Chrome webDriver using the ChromeDriverManager.
+def GetDriver():
+    global driver
+    if driver is None:
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    return driver
 
-# Function to set the assistant's status by writing it to a file.
+# Function to set the assistant's status by publishing it on the event bus.
 def SetAssistantStatus(Status):
-    with open(rf"{TempDirPath}/Status.data", "w", encoding='utf-8') as file:
-        file.write(Status)
+    bus.publish(STATUS, Status)
 
 # Function to modify a query to ensure proper punctuation and formatting.
 def QueryModifier(Query):
@@ -107,7 +113,9 @@ def UniversalTranslator(Text):
     english_translation = mt.translate(Text, "en", "auto")
     return english_translation.capitalize()
 
+@Traced("SpeechRecognition")
 def SpeechRecognition():
+    driver = GetDriver()
     driver.get("file:///" + Link)
     driver.find_element(by=By.ID, value="start").click()
 
@@ -0,0 +1,110 @@
+import builtins  # The import hook is installed on builtins.__import__.
+import importlib  # Resolves lazy targets and warmup modules.
+import sys  # Checks which modules are already loaded.
+import threading  # Warmup runs on a background thread.
+import time  # High resolution timers for the report.
+
+
+class ImportTimer:
+    """Records the time spent in every first-time import, in the spirit of `python -X importtime`.
+
+    Only imports made on the thread that started the timer are recorded, so background
+    warmup does not skew the cold-start numbers.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.records = []  # (module, self seconds, cumulative seconds, depth) in completion order.
+        self._stack = []
+        self._original = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.get_ident()
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def stop(self):
+        if self._original is not None and builtins.__import__ is self._import:
+            builtins.__import__ = self._original
+        self.finished = time.perf_counter()
+        return self.finished - self.started
+
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or threading.get_ident() != self._thread:
+            return self._original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += cumulative
+            self.records.append((name, cumulative - children, cumulative, len(self._stack)))
+
+    def report(self, budget=None, file=None):
+        """Print the import table followed by the cold-start total and the budget verdict."""
+        file = file or sys.stdout
+        print("import time: self [us] | cumulative | imported package", file=file)
+        for name, own, cumulative, depth in self.records:
+            print(f"import time: {own * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}", file=file)
+
+        total = self.elapsed()
+        print(f"[INFO] Cold start took {total:.2f}s", file=file)
+        if budget is not None and total > budget:
+            slowest = sorted((r for r in self.records if r[3] == 0), key=lambda r: r[2], reverse=True)[:5]
+            names = ", ".join(f"{name} ({cumulative:.2f}s)" for name, _, cumulative, _ in slowest)
+            print(f"[WARNING] Cold start exceeded the {budget:.2f}s budget; slowest imports: {names}", file=file)
+        return total
+
+
+class Lazy:
+    """Stands in for a callable and imports the module that defines it on first use."""
+
+    def __init__(self, module, attribute):
+        self.module = module
+        self.attribute = attribute
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self.module), self.attribute)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<Lazy {self.module}.{self.attribute}>"
+
+
+def Warmup(*steps):
+    """Import modules (given by name) and run callables on a background thread, in order."""
+
+    def Run():
+        for step in steps:
+            start = time.perf_counter()
+            try:
+                if isinstance(step, str):
+                    importlib.import_module(step)
+                    label = step
+                else:
+                    step()
+                    label = getattr(step, "__name__", repr(step))
+            except Exception as e:
+                print(f"[WARNING] Warmup of {step} failed: {e}")
+                continue
+            print(f"[INFO] Warmed {label} in {time.perf_counter() - start:.2f}s")
+
+    thread = threading.Thread(target=Run, name="warmup", daemon=True)
+    thread.start()
+    return thread
@@ -3,38 +3,35 @@ import random  # For generating random responses
 import asyncio  # For asynchronous operations
 import edge_tts  # For text-to-speech functionality
 import os  # For file operations
+import queue  # For handing sentences and clips between the speech threads
+import threading  # For running synthesis and playback in the background
 from dotenv import dotenv_values  # To read environment variables
+from Backend.Tracing import Traced  # Per-stage latency spans.
 
 # Load environment variables from a .env file
 env_vars = dotenv_values(".env")
 AssistantVoice = env_vars.get("AssistantVoice")  # e.g., 'en-US-AriaNeural'
 
 # Asynchronous function to convert text to an audio file
-async def TextToAudioFile(text) -> None:
-    file_path = rf"Data\speech.mp3"
+async def TextToAudioFile(text, file_path=rf"Data\speech.mp3") -> None:
     if os.path.exists(file_path):
         os.remove(file_path)
     communicate = edge_tts.Communicate(text, AssistantVoice, pitch='+5Hz', rate='+13%')
-    await communicate.save(rf'Data\speech.mp3')
+    await communicate.save(file_path)
 
-# Function to manage Text-to-Speech (TTS) functionality
-def TTS(Text, func=lambda r=None: True):
+# Function to play an audio file until it ends or func() returns False
+def PlayAudioFile(file_path, func=lambda r=None: True):
     try:
-        while True:
-            asyncio.run(TextToAudioFile(Text))
-            pygame.mixer.init()
-            pygame.mixer.music.load(rf"Data\speech.mp3")
-            pygame.mixer.music.play()
+        pygame.mixer.init()
+        pygame.mixer.music.load(file_path)
+        pygame.mixer.music.play()
 
-            while pygame.mixer.music.get_busy():
-                if func() == False:
-                    break
-                pygame.time.Clock().tick(10)
+        while pygame.mixer.music.get_busy():
+            if func() == False:
+                break
+            pygame.time.Clock().tick(10)
 
-            return True
-
-    except Exception as e:
-        print(f"Error in TTS: {e}")
+        return True
 
     finally:
         try:
@@ -44,38 +41,133 @@ def TTS(Text, func=lambda r=None: True):
         except Exception as e:
             print(f"Error in finally block: {e}")
 
+# Function to manage Text-to-Speech (TTS) functionality
+def TTS(Text, func=lambda r=None: True):
+    try:
+        asyncio.run(TextToAudioFile(Text))
+        return PlayAudioFile(rf"Data\speech.mp3", func)
+
+    except Exception as e:
+        print(f"Error in TTS: {e}")
+
+# Lines spoken in place of long answers that continue on the chat screen
+responses = [
+    "The rest of the result has been printed to the chat screen, kindly check it out sir.",
+    "The rest of the text is now on the chat screen, sir, please check it.",
+    "You can see the rest of the text on the chat screen, sir.",
+    "The remaining part of the text is now on the chat screen, sir.",
+    "Sir, you'll find more text on the chat screen for you to see.",
+    "The rest of the answer is now on the chat screen, sir.",
+    "Sir, please look at the chat screen, the rest of the answer is there.",
+    "You'll find the complete answer on the chat screen, sir.",
+    "The next part of the text is on the chat screen, sir.",
+    "Sir, please check the chat screen for more information.",
+    "There's more text on the chat screen for you, sir.",
+    "Sir, take a look at the chat screen for additional text.",
+    "You'll find more to read on the chat screen, sir.",
+    "Sir, check the chat screen for the rest of the text.",
+    "The chat screen has the rest of the text, sir.",
+    "There's more to see on the chat screen, sir, please look.",
+    "Sir, the chat screen holds the continuation of the text.",
+    "You'll find the complete answer on the chat screen, kindly check it out sir.",
+    "Please review the chat screen for the rest of the text, sir.",
+    "Sir, look at the chat screen for the complete answer."
+]
+
 # Function to manage Text-to-Speech with smart splitting
+@Traced("TextToSpeech")
 def TextToSpeech(Text, func=lambda r=None: True):
     Data = str(Text).split(".")
 
-    responses = [
-        "The rest of the result has been printed to the chat screen, kindly check it out sir.",
-        "The rest of the text is now on the chat screen, sir, please check it.",
-        "You can see the rest of the text on the chat screen, sir.",
-        "The remaining part of the text is now on the chat screen, sir.",
-        "Sir, you'll find more text on the chat screen for you to see.",
-        "The rest of the answer is now on the chat screen, sir.",
-        "Sir, please look at the chat screen, the rest of the answer is there.",
-        "You'll find the complete answer on the chat screen, sir.",
-        "The next part of the text is on the chat screen, sir.",
-        "Sir, please check the chat screen for more information.",
-        "There's more text on the chat screen for you, sir.",
-        "Sir, take a look at the chat screen for additional text.",
-        "You'll find more to read on the chat screen, sir.",
-        "Sir, check the chat screen for the rest of the text.",
-        "The chat screen has the rest of the text, sir.",
-        "There's more to see on the chat screen, sir, please look.",
-        "Sir, the chat screen holds the continuation of the text.",
-        "You'll find the complete answer on the chat screen, kindly check it out sir.",
-        "Please review the chat screen for the rest of the text, sir.",
-        "Sir, look at the chat screen for the complete answer."
-    ]
-
     if len(Data) > 4 and len(Text) >= 250:
         TTS("".join(Text.split(".")[0:2]) + ". " + random.choice(responses), func)
     else:
         TTS(Text, func)
 
+# Class that speaks sentences as they arrive, synthesizing the next one while the current one plays
+class SpeechQueue:
+    def __init__(self, spoken_sentences=2):
+        self.spoken_sentences = spoken_sentences  # Sentences spoken before deferring to the chat screen
+        self.sentences = queue.Queue()
+        self.clips = queue.Queue(maxsize=2)  # Synthesized clips waiting for playback
+        self.pending = 0
+        self.played = 0  # Clips that have started playing.
+        self.lock = threading.Lock()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.started = False
+
+    def start(self):
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+        threading.Thread(target=self.synthesize_loop, daemon=True).start()
+        threading.Thread(target=self.playback_loop, daemon=True).start()
+
+    def say(self, text):
+        """Queue one sentence for speech without waiting for it to play."""
+        if not str(text).strip():
+            return
+        self.start()
+        with self.lock:
+            self.pending += 1
+            self.idle.clear()
+        self.sentences.put(str(text))
+
+    def say_stream(self, sentences):
+        """Speak sentences as they are produced, following the same truncation rule as TextToSpeech."""
+        held = []
+        spoken = 0
+        length = 0
+        for sentence in sentences:
+            length += len(sentence)
+            if spoken < self.spoken_sentences:
+                self.say(sentence)
+                spoken += 1
+            else:
+                held.append(sentence)
+
+        if spoken + len(held) > 4 and length >= 250:
+            self.say(random.choice(responses))
+        else:
+            for sentence in held:
+                self.say(sentence)
+
+    def wait(self, timeout=None):
+        """Block until everything queued so far has finished playing."""
+        return self.idle.wait(timeout)
+
+    def synthesize_loop(self):
+        count = 0
+        while True:
+            text = self.sentences.get()
+            # Four rotating files: one playing, two queued and one being written.
+            file_path = rf"Data\speech_{count % 4}.mp3"
+            count += 1
+            try:
+                asyncio.run(TextToAudioFile(text, file_path))
+            except Exception as e:
+                print(f"Error in TTS: {e}")
+                file_path = None
+            self.clips.put(file_path)
+
+    def playback_loop(self):
+        while True:
+            file_path = self.clips.get()
+            try:
+                if file_path:
+                    with self.lock:
+                        self.played += 1
+                    PlayAudioFile(file_path)
+            except Exception as e:
+                print(f"Error in TTS: {e}")
+            finally:
+                with self.lock:
+                    self.pending -= 1
+                    if self.pending == 0:
+                        self.idle.set()
+
 # Main execution loop
 if __name__ == "__main__":
     while True:
@@ -0,0 +1,161 @@
+import contextvars  # Carries the current turn ID into worker threads and coroutines.
+import functools  # Preserves wrapped function metadata.
+import inspect  # Distinguishes plain, async and generator functions.
+import itertools  # Turn ID sequence.
+import json  # On-demand dumps.
+import math  # Nearest-rank percentile index.
+import threading  # Protects the histograms.
+import time  # Span timing.
+from collections import deque  # Rolling windows of samples and recent turns.
+from contextlib import contextmanager  # Span context manager.
+
+# ID of the turn the current thread or task is working on.
+CurrentTurn = contextvars.ContextVar("CurrentTurn", default=None)
+TurnCounter = itertools.count(1)
+
+
+def BeginTurn():
+    """Start a new turn in the current context and return its ID."""
+    turn_id = f"turn-{next(TurnCounter)}"
+    CurrentTurn.set(turn_id)
+    return turn_id
+
+
+class Histogram:
+    """Keeps the most recent samples of one stage and reports percentiles over them."""
+
+    def __init__(self, window=1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+
+    def add(self, seconds, ok=True):
+        self.samples.append(seconds)
+        self.count += 1
+        if not ok:
+            self.errors += 1
+
+    def percentile(self, ordered, fraction):
+        # Nearest-rank percentile over an already sorted list.
+        index = max(0, math.ceil(fraction * len(ordered)) - 1)
+        return ordered[index]
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": self.count, "errors": self.errors}
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": round(self.percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(self.percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(self.percentile(ordered, 0.99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+
+
+class Tracer:
+    """Collects timed spans per stage and per turn, in memory only."""
+
+    def __init__(self, window=1000, recent_turns=50):
+        self.window = window
+        self.histograms = {}
+        self.turns = {}
+        self.turn_order = deque()
+        self.recent_turns = recent_turns
+        self.lock = threading.Lock()
+
+    def record(self, stage, started, seconds, ok=True, turn_id=None):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram(self.window)
+            histogram.add(seconds, ok)
+
+            if turn_id is not None:
+                spans = self.turns.get(turn_id)
+                if spans is None:
+                    spans = self.turns[turn_id] = []
+                    self.turn_order.append(turn_id)
+                    if len(self.turn_order) > self.recent_turns:
+                        self.turns.pop(self.turn_order.popleft(), None)
+                spans.append({"stage": stage, "start": round(started, 6), "ms": round(seconds * 1000, 2), "ok": ok})
+
+    @contextmanager
+    def span(self, stage):
+        turn_id = CurrentTurn.get()
+        started = time.time()
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except GeneratorExit:
+            raise  # A stream closed early by its consumer is not a failure.
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.record(stage, started, time.perf_counter() - start, ok, turn_id)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "stages": {stage: histogram.summary() for stage, histogram in self.histograms.items()},
+                "turns": {turn_id: list(self.turns[turn_id]) for turn_id in self.turn_order},
+            }
+
+    def dump_json(self, path=None):
+        """Return the current histograms and recent turns as JSON, also writing them to path if given."""
+        data = json.dumps(self.snapshot(), indent=4)
+        if path:
+            with open(path, "w", encoding='utf-8') as file:
+                file.write(data)
+        return data
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.turns.clear()
+            self.turn_order.clear()
+
+
+# Process-wide tracer used by the Traced decorator.
+tracer = Tracer()
+
+
+def Span(stage):
+    return tracer.span(stage)
+
+
+def Traced(stage):
+    """Decorator that times every call of a function (plain, async or generator) as one span."""
+
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with tracer.span(stage):
+                    return await func(*args, **kwargs)
+        elif inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with tracer.span(stage):
+                    async for item in func(*args, **kwargs):
+                        yield item
+        elif inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with tracer.span(stage):
+                    yield from func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with tracer.span(stage):
+                    return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def DumpTraces(path=None):
+    return tracer.dump_json(path)
@@ -0,0 +1,180 @@
+import asyncio  # Async callers only leave the event loop on a cache miss.
+import json  # Local result fixtures.
+import re
+import threading  # Searches come from several intent threads at once.
+import time  # Entry expiry.
+from collections import OrderedDict  # LRU order of cached results.
+from concurrent.futures import Future  # Shared by concurrent identical searches.
+from dotenv import dotenv_values  # Backend and TTLs come from .env.
+from Backend.Resilience import Call  # Retries, backoff and the provider circuit breaker.
+
+env_vars = dotenv_values(".env")
+
+# Search results for realtime answers. Results are cached per normalized query, for a short time
+# when the query is about something that changes (news, scores, prices) and longer for lookups of
+# people, places and things. Identical searches that overlap share one fetch.
+
+SearchBackendName = env_vars.get("SearchBackend", "google")
+SearchFixtures = env_vars.get("SearchFixtures", rf"Data\SearchFixtures.json")
+SearchTTL = float(env_vars.get("SearchTTL", 6 * 3600))
+SearchNewsTTL = float(env_vars.get("SearchNewsTTL", 300))
+SearchCacheSize = int(env_vars.get("SearchCacheSize", 256))
+
+Timely = re.compile(
+    r"\b(?:news|latest|today|tonight|yesterday|now|current|currently|live|score|scores|match|weather|"
+    r"forecast|price|prices|stock|stocks|rate|rates|election|results?|trending|this (?:week|month|year))\b"
+)
+
+
+def NormalizeQuery(query):
+    return " ".join(re.findall(r"\w+", query.lower()))
+
+
+class GoogleBackend:
+    """Result URLs from googlesearch-python."""
+
+    name = "google"
+
+    def search(self, query, count):
+        from googlesearch import search  # Imported on first use; the replay harness swaps the module.
+        return list(search(query, num_results=count))
+
+
+class LocalBackend:
+    """Canned results for tests and benchmarks: {normalized query: [url, ...]}, optionally from a JSON file."""
+
+    name = "local"
+
+    def __init__(self, results=None, path=None, delay=0.0):
+        self.results = {NormalizeQuery(query): list(urls) for query, urls in (results or {}).items()}
+        if path:
+            with open(path, "r", encoding='utf-8') as file:
+                self.results.update({NormalizeQuery(query): list(urls) for query, urls in json.load(file).items()})
+        self.delay = delay  # Simulated network time per search.
+        self.calls = 0
+
+    def search(self, query, count):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self.results.get(NormalizeQuery(query), [])[:count]
+
+
+def DefaultBackend():
+    if SearchBackendName == "local":
+        return LocalBackend(path=SearchFixtures)
+    return GoogleBackend()
+
+
+class WebSearch:
+    """TTL-cached search with in-flight deduplication in front of a pluggable backend."""
+
+    def __init__(self, backend=None, ttl=SearchTTL, news_ttl=SearchNewsTTL, capacity=SearchCacheSize):
+        self.backend = backend or DefaultBackend()
+        self.ttl = ttl
+        self.news_ttl = news_ttl
+        self.capacity = capacity
+        self.entries = OrderedDict()  # (normalized query, count) -> (expires, results, {"passages": text})
+        self.inflight = {}  # (normalized query, count) -> Future
+        self.lock = threading.Lock()
+        self.counts = {"hits": 0, "misses": 0, "shared": 0, "errors": 0, "passage_hits": 0}
+
+    def ttl_for(self, text):
+        return self.news_ttl if Timely.search(text) else self.ttl
+
+    def cached(self, key):
+        # Called with the lock held.
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        self.counts["hits"] += 1
+        return entry[1]
+
+    def search(self, query, count=5):
+        """Result URLs for the query, from the cache, a fetch already in progress, or the backend."""
+        key = (NormalizeQuery(query), count)
+        with self.lock:
+            results = self.cached(key)
+            if results is not None:
+                return list(results)
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+                self.counts["misses"] += 1
+            else:
+                self.counts["shared"] += 1
+
+        if not owner:
+            return list(future.result())
+
+        try:
+            results = Call(self.backend.name, self.backend.search, query, count)
+        except Exception as e:
+            with self.lock:
+                self.counts["errors"] += 1
+                del self.inflight[key]
+            future.set_exception(e)
+            raise
+
+        ttl = self.ttl_for(key[0])
+        with self.lock:
+            # An empty page is usually a consent wall or a soft block, so it is asked again next time.
+            if results and ttl > 0 and self.capacity > 0:
+                self.entries[key] = (time.monotonic() + ttl, results, {})
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.capacity:
+                    self.entries.popitem(last=False)
+            del self.inflight[key]
+        future.set_result(results)
+        return list(results)
+
+    async def search_async(self, query, count=5):
+        """Like search(); a cache hit is answered on the event loop, a miss on the default executor."""
+        key = (NormalizeQuery(query), count)
+        with self.lock:
+            results = self.cached(key)
+        if results is not None:
+            return list(results)
+        return await asyncio.to_thread(self.search, query, count)
+
+    def passages(self, query, count=5):
+        """Page passages kept with the cached results for the query, or None."""
+        with self.lock:
+            entry = self.entries.get((NormalizeQuery(query), count))
+            if entry is None or entry[0] <= time.monotonic() or "passages" not in entry[2]:
+                return None
+            self.counts["passage_hits"] += 1
+            return entry[2]["passages"]
+
+    def keep_passages(self, query, count, passages):
+        """Store page passages with the cached results, so they expire together; empty ones are not kept."""
+        with self.lock:
+            entry = self.entries.get((NormalizeQuery(query), count))
+            if entry is not None and passages:
+                entry[2]["passages"] = passages
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counts)
+            stats["size"] = len(self.entries)
+            stats["backend"] = self.backend.name
+            lookups = stats["hits"] + stats["misses"] + stats["shared"]
+            stats["hit_rate"] = round((stats["hits"] + stats["shared"]) / lookups, 4) if lookups else None
+            return stats
+
+
+# Shared by every realtime answer path.
+web_search = WebSearch()
+
+
+def SearchStats():
+    return web_search.stats()
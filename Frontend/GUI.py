@@ -4,8 +4,25 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import (
     QIcon, QPainter, QMovie, QColor, QTextCharFormat, QFont, QPixmap, QTextBlockFormat
 )
-from PyQt5.QtCore import Qt, QSize, QTimer
+from PyQt5.QtCore import Qt, QSize, QObject, QTimer, pyqtSignal
 from dotenv import dotenv_values
+from Backend.EventBus import bus, STATUS, RESPONSE, PARTIAL
+from Frontend.Helpers import (
+    AnswerModifier,
+    QueryModifier,
+    SetMicrophoneStatus,
+    GetMicrophoneStatus,
+    SetAssistantStatus,
+    GetAssistantStatus,
+    MicButtonInitialed,
+    MicButtonClosed,
+    GraphicsDirectoryPath,
+    TempDirectoryPath,
+    ShowTextToScreen,
+    TempDirPath,
+    GraphicsDirPath
+)
+import threading
 import sys
 import os
 
@@ -14,64 +31,36 @@ Assistantname = env_vars.get("Assistantname")
 current_dir = os.getcwd()
 old_chat_message = " "
 
-TempDirPath = rf"{current_dir}\Frontend\Files"
-GraphicsDirPath = rf"{current_dir}\Frontend\Graphics"
-
-def AnswerModifier(Answer):
-    lines = Answer.split('\n')
-    non_empty_lines = [line for line in lines if line.strip()]
-    modfied_answer = '\n'.join(non_empty_lines)
-    return modfied_answer
-
-def QueryModifier(Query):
-    query = Query.lower().strip()
-    words = query.split()
-
-    question_words = ["how", "what", "who", "where", "when", "why", "which", "whose", "whom", "can you", "what's", "where's", "how's"]
-
-    if any(word in query for word in question_words):
-        if query[-1] in ['.', '?', '1']:
-            return query
-        else:
-            return query + "?"
-    else:
-        if query[-1] in ['.', '?']:
-            query = query[:-1]
-        return query.capitalize() + "."
-
-
-
-def SetMicrophoneStatus(Command):
-    with open(rf"{TempDirPath}\Mic.data", "w", encoding='utf-8') as file:
-        file.write(Command)
-
-def GetMicrophoneStatus():
-    with open(rf"{TempDirPath}\Mic.data", "r", encoding='utf-8') as file:
-        return file.read()
-
-def SetAssistantStatus(Status):
-    with open(rf"{TempDirPath}\Status.data", "w", encoding='utf-8') as file:
-        file.write(Status)
 
-def GetAssistantStatus():
-    with open(rf"{TempDirPath}\Status.data", "r", encoding='utf-8') as file:
-        return file.read()
+class EventBridge(QObject):
+    """Re-emits bus events as Qt signals so widgets update on the GUI thread."""
+    statusChanged = pyqtSignal(str)
+    responseReceived = pyqtSignal(str)
+    partialReceived = pyqtSignal(str, bool)
 
-def MicButtonInitialed():
-    SetMicrophoneStatus("False")
-
-def MicButtonClosed():
-    SetMicrophoneStatus("True")
-
-def GraphicsDirectoryPath(Filename):
-    Path = rf"{GraphicsDirPath}\{Filename}"
-    return Path
-def TempDirectoryPath(Filename):
-    Path = rf"{TempDirPath}\{Filename}"
-    return Path
-def ShowTextToScreen(Text):
-    with open(rf"{TempDirPath}\Responses.data", "w", encoding='utf-8') as file:
-        file.write(Text)
+    def __init__(self):
+        super().__init__()
+        self.events = bus.subscribe(STATUS, RESPONSE, PARTIAL)
+        threading.Thread(target=self.pump, daemon=True).start()
+
+    def pump(self):
+        while True:
+            topic, value = self.events.get()
+            if topic == STATUS:
+                self.statusChanged.emit(str(value))
+            elif topic == RESPONSE:
+                self.responseReceived.emit(str(value))
+            elif topic == PARTIAL:
+                first, text = value
+                self.partialReceived.emit(str(text), bool(first))
+
+event_bridge = None
+
+def GetEventBridge():
+    global event_bridge
+    if event_bridge is None:
+        event_bridge = EventBridge()
+    return event_bridge
 
 # [KEEP YOUR IMPORTS AND VARIABLES AS IS]
 
@@ -107,10 +96,13 @@ class ChatSection(QWidget):
         font = QFont()
         font.setPointSize(13)
         self.chat_text_edit.setFont(font)
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.loadMessages)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(500)
+        bridge = GetEventBridge()
+        self.partial_start = None  # Where the answer that is still streaming in begins.
+        bridge.responseReceived.connect(self.loadMessages)
+        bridge.partialReceived.connect(self.loadPartialMessage)
+        bridge.statusChanged.connect(self.SpeechRecogText)
+        self.loadMessages(bus.latest(RESPONSE))
+        self.SpeechRecogText(bus.latest(STATUS))
         self.chat_text_edit.viewport().installEventFilter(self)
 
         self.setStyleSheet("""
@@ -120,10 +112,8 @@ class ChatSection(QWidget):
             QScrollBar::up-arrow:vertical, QScrollBar::down-arrow:vertical { background: black; height: 10px; }
         """)
 
-    def loadMessages(self):
+    def loadMessages(self, messages):
         global old_chat_message
-        with open(TempDirectoryPath('Responses.data'), "r", encoding='utf-8') as file:
-            messages = file.read()
 
         if messages is None:
             pass
@@ -135,12 +125,34 @@ class ChatSection(QWidget):
             pass
 
         else:
+            self.clearPartialMessage()
             self.addMessage(messages, color='White')
             old_chat_message = messages
 
-    def SpeechRecogText(self):
-        with open(TempDirectoryPath("Status.data"), "r", encoding="utf-8") as file:
-            messages = file.read()
+    def loadPartialMessage(self, text, first):
+        # Append to the streaming answer; the final message replaces all of it.
+        if first or self.partial_start is None:
+            self.clearPartialMessage()
+            self.partial_start = self.chat_text_edit.textCursor().position()
+            self.addMessage(text, color='White')
+            return
+        cursor = self.chat_text_edit.textCursor()
+        cursor.movePosition(cursor.End)
+        cursor.movePosition(cursor.PreviousCharacter)  # Before the newline addMessage ended with.
+        cursor.insertText(text)
+        self.chat_text_edit.setTextCursor(cursor)
+
+    def clearPartialMessage(self):
+        if self.partial_start is None:
+            return
+        cursor = self.chat_text_edit.textCursor()
+        cursor.setPosition(self.partial_start)
+        cursor.movePosition(cursor.End, cursor.KeepAnchor)
+        cursor.removeSelectedText()
+        self.chat_text_edit.setTextCursor(cursor)
+        self.partial_start = None
+
+    def SpeechRecogText(self, messages):
         self.label.setText(messages)
 
     def load_icon(self, path, width=60, height=60):
@@ -206,13 +218,10 @@ class InitialScreen(QWidget):
         self.setFixedWidth(screen_width)
         self.setStyleSheet("background-color: black;")
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(500)
+        GetEventBridge().statusChanged.connect(self.SpeechRecogText)
+        self.SpeechRecogText(bus.latest(STATUS))
 
-    def SpeechRecogText(self):
-        with open(TempDirectoryPath('Status.data'), "r", encoding="utf-8") as file:
-            messages = file.read()
+    def SpeechRecogText(self, messages):
         self.label.setText(messages)
 
     def load_icon(self, path, width=60, height=60):
@@ -333,10 +342,13 @@ class MainWindow(QMainWindow):
         self.setGeometry(0, 0, screen_width, screen_height)
         self.setStyleSheet("background-color: black;")
 
-def GraphicalUserInterface():
+def GraphicalUserInterface(on_shown=None):
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    if on_shown is not None:
+        # Runs once the event loop has painted the window.
+        QTimer.singleShot(0, on_shown)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
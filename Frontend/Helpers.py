@@ -0,0 +1,73 @@
+from dotenv import dotenv_values
+from Backend.EventBus import bus, FileMirrorSink, MIC, STATUS, RESPONSE, PARTIAL
+import os
+
+# Qt-free helpers shared by the GUI and the assistant worker, so the worker can
+# start (or run headless) without importing PyQt5.
+
+env_vars = dotenv_values(".env")
+current_dir = os.getcwd()
+
+TempDirPath = rf"{current_dir}\Frontend\Files"
+GraphicsDirPath = rf"{current_dir}\Frontend\Graphics"
+
+# Mirror mic/status/response traffic into Frontend/Files only when debugging.
+if str(env_vars.get("DebugFileMirror", "False")).lower() == "true":
+    bus.add_sink(FileMirrorSink(TempDirPath))
+
+def AnswerModifier(Answer):
+    lines = Answer.split('\n')
+    non_empty_lines = [line for line in lines if line.strip()]
+    modfied_answer = '\n'.join(non_empty_lines)
+    return modfied_answer
+
+def QueryModifier(Query):
+    query = Query.lower().strip()
+    words = query.split()
+
+    question_words = ["how", "what", "who", "where", "when", "why", "which", "whose", "whom", "can you", "what's", "where's", "how's"]
+
+    if any(word in query for word in question_words):
+        if query[-1] in ['.', '?', '1']:
+            return query
+        else:
+            return query + "?"
+    else:
+        if query[-1] in ['.', '?']:
+            query = query[:-1]
+        return query.capitalize() + "."
+
+
+
+def SetMicrophoneStatus(Command):
+    bus.publish(MIC, Command)
+
+def GetMicrophoneStatus():
+    return bus.latest(MIC, "False")
+
+def SetAssistantStatus(Status):
+    bus.publish(STATUS, Status)
+
+def GetAssistantStatus():
+    return bus.latest(STATUS)
+
+def MicButtonInitialed():
+    SetMicrophoneStatus("False")
+
+def MicButtonClosed():
+    SetMicrophoneStatus("True")
+
+def GraphicsDirectoryPath(Filename):
+    Path = rf"{GraphicsDirPath}\{Filename}"
+    return Path
+def TempDirectoryPath(Filename):
+    Path = rf"{TempDirPath}\{Filename}"
+    return Path
+def ShowTextToScreen(Text):
+    bus.publish(RESPONSE, Text)
+
+
+def ShowPartialTextToScreen(Text, first=False):
+    """Add text to an answer that is still being generated; first starts a new one, and the
+    next ShowTextToScreen replaces it."""
+    bus.publish(PARTIAL, (first, Text))
@@ -1,7 +1,13 @@
-from Frontend.GUI import (
-    GraphicalUserInterface,
+from Backend.Startup import ImportTimer, Lazy, Warmup
+# Time every import made while starting the assistant (see --startup-report).
+import_timer = ImportTimer()
+if __name__ == "__main__":
+    import_timer.start()
+
+from Frontend.Helpers import (
     SetAssistantStatus,
     ShowTextToScreen,
+    ShowPartialTextToScreen,
     TempDirectoryPath,
     SetMicrophoneStatus,
     AnswerModifier,
@@ -9,80 +15,112 @@ from Frontend.GUI import (
     GetMicrophoneStatus,
     GetAssistantStatus
 )
-from Backend.Model import FirstLayerDMM
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
-try:
-    from Backend.Automation import Automation
-except Exception as e:
-    print(f"[WARNING] Error importing Automation: {e}")
-    Automation = None
-from Backend.SpeechToText import SpeechRecognition
-from Backend.Chatbot import ChatBot
-from Backend.TextToSpeech import TextToSpeech
-from Backend.PDFGenerator import open_notepad_and_wait, convert_text_to_pdf, open_pdf, get_content_type_from_voice, generate_dynamic_content
-from Backend.Alarm import SetAlarm
-from Backend.FileFolderCreator import create_folder, create_file
-from Backend.EmailHandler import send_email, extract_email_info_from_query, send_email_manually
+from Backend.EventBus import bus, RateCounter, MIC, IMAGE
+from Backend.Pipeline import SplitSentences, TurnPipeline
+from Backend.Dispatcher import Dispatcher
+from Backend.Tracing import BeginTurn, DumpTraces
+from Backend.ConversationBuffer import BufferStats
 from dotenv import dotenv_values
+import atexit
 import json
 import os
 import sys
 import time
 import threading
-import subprocess
 from datetime import datetime
-import pygame
 import asyncio
 import logging
 from time import sleep
 from asyncio import run
 import queue
 
+# Heavy backends (Selenium, pygame, Cohere, Groq, pywhatkit, Tk) load on first use
+# or in the background once the window is visible.
+FirstLayerDMMStream = Lazy("Backend.Model", "FirstLayerDMMStream")
+RealtimeSearchEngine = Lazy("Backend.RealtimeSearchEngine", "RealtimeSearchEngine")
+RealtimeSearchEngineStream = Lazy("Backend.RealtimeSearchEngine", "RealtimeSearchEngineStream")
+Automation = Lazy("Backend.Automation", "Automation")
+SpeechRecognition = Lazy("Backend.SpeechToText", "SpeechRecognition")
+ChatBot = Lazy("Backend.Chatbot", "ChatBot")
+ChatBotStream = Lazy("Backend.Chatbot", "ChatBotStream")
+SpeculativeChat = Lazy("Backend.Chatbot", "SpeculativeChat")
+TextToSpeech = Lazy("Backend.TextToSpeech", "TextToSpeech")
+open_notepad_and_wait = Lazy("Backend.PDFGenerator", "open_notepad_and_wait")
+convert_text_to_pdf = Lazy("Backend.PDFGenerator", "convert_text_to_pdf")
+open_pdf = Lazy("Backend.PDFGenerator", "open_pdf")
+get_content_type_from_voice = Lazy("Backend.PDFGenerator", "get_content_type_from_voice")
+generate_dynamic_content = Lazy("Backend.PDFGenerator", "generate_dynamic_content")
+SetAlarm = Lazy("Backend.Alarm", "SetAlarm")
+create_folder = Lazy("Backend.FileFolderCreator", "create_folder")
+create_file = Lazy("Backend.FileFolderCreator", "create_file")
+send_email = Lazy("Backend.EmailHandler", "send_email")
+send_email_with_manual_input = Lazy("Backend.EmailHandler", "send_email_with_manual_input")
+extract_email_info_from_query = Lazy("Backend.EmailHandler", "extract_email_info_from_query")
+
 gui_command_queue = queue.Queue()
 
 # Configure logger
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
-# Import email functions
-from Backend.EmailHandler import (
-    send_email,
-    send_email_with_manual_input,
-    extract_email_info_from_query,
-    format_email_with_llm
-)
-from Backend.SignLanguageTranslator import SignLanguageTranslator
-
 # ---------- Load Environment Variables ----------
 env_vars = dotenv_values(".env")
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
+# Overlap capture, answer generation and speech instead of running each turn start to finish.
+PipelinedTurns = str(env_vars.get("PipelinedTurns", "False")).lower() == "true"
+# Show general and realtime answers as they are generated and speak them sentence by sentence.
+StreamAnswers = str(env_vars.get("StreamAnswers", "True")).lower() != "false"
+PartialInterval = 0.1  # Seconds between screen updates of an answer that is still streaming in.
+# Start the ChatBot answer while FirstLayerDMM is still deciding; dropped unless the decision is "general".
+SpeculativeAnswers = str(env_vars.get("SpeculativeChat", "False")).lower() == "true"
 
 # Default welcome message when assistant starts
 DefaultMessage = f'''{Username}: Hello {Assistantname}, How are you?
 {Assistantname}: Welcome {Username}. I am doing well. How may I help you?'''
 
 # ---------- Global Variables ----------
-subprocesses = []
 Functions = ["open", "close", "play", "system", "content", "google search", "youtube search", "pdf conversion", "alarm", "send_email", "sign language"]
 
-# Initialize Sign Language Translator
-sign_translator = SignLanguageTranslator()
+# Write per-stage latency histograms here when the assistant exits (empty to disable).
+TraceFile = env_vars.get("TraceFile", "")
+if TraceFile:
+    atexit.register(DumpTraces, TraceFile)
+
+# Record every turn to this JSON lines file for Backend/Replay.py (empty to disable).
+RecordTurns = env_vars.get("RecordTurns", "")
+recorder = None
+
+# Number of image jobs the background image worker runs at the same time.
+MaxImageJobs = int(env_vars.get("MaxImageJobs", 1))
+
+# Cold start (process start to visible window) is expected to stay within this many seconds.
+StartupBudget = float(env_vars.get("StartupBudgetSeconds", 3.0))
+StartupReport = "--startup-report" in sys.argv or str(env_vars.get("StartupReport", "False")).lower() == "true"
+
+# Background speech used when turns are pipelined; created on first use.
+speech_queue = None
+
+
+def GetSpeechQueue():
+    global speech_queue
+    if speech_queue is None:
+        from Backend.TextToSpeech import SpeechQueue
+        speech_queue = SpeechQueue()
+    return speech_queue
 
 
 def ShowDefaultChatIfNoChats():
-    file = open(rf'Data\ChatLog.json', "r", encoding='utf-8')
-    if len(file.read()) < 5:
+    from Backend.ChatLogStore import chat_log
+    if not chat_log.snapshot():
         with open(TempDirectoryPath('Database.data'), 'w', encoding='utf-8') as file:
             file.write("")
-        with open(TempDirectoryPath('Responses.data'), 'w', encoding='utf-8') as file:
-            file.write(DefaultMessage)
+        ShowTextToScreen(DefaultMessage)
 
 
 def ReadChatLogJson():
-    with open(rf'Data\ChatLog.json', 'r', encoding='utf-8') as file:
-        chatlog_data = json.load(file)
-    return chatlog_data
+    from Backend.ChatLogStore import chat_log
+    return chat_log.messages()
 
 
 def ChatLogIntegration():
@@ -110,8 +148,7 @@ def ShowChatsOnGUI():
         lines = Data.split('\n')
         result = '\n'.join(lines)
 
-        with open(TempDirectoryPath('Responses.data'), "w", encoding='utf-8') as file:
-            file.write(result)
+        ShowTextToScreen(result)
 
 
 def InitialExecution():
@@ -122,7 +159,188 @@ def InitialExecution():
     ShowChatsOnGUI()
 
 
+# Set in headless mode: receives every answer instead of the speakers.
+SpeechSink = None
+
+
+def Speak(Text, wait=False):
+    """Speak the text; in pipelined mode it is queued unless wait is set."""
+    if SpeechSink is not None:
+        SpeechSink(Text)
+    elif PipelinedTurns:
+        GetSpeechQueue().say_stream(SplitSentences([str(Text)]))
+        if wait:
+            GetSpeechQueue().wait()
+    else:
+        TextToSpeech(Text)
+
+
+def SpeakStream(Chunks, wait=False):
+    """Show the answer as it streams in, queue each sentence for speech as soon as it is complete
+    and return the full answer; with wait set, return only after it has been spoken."""
+    Parts = []
+
+    def Record():
+        # The screen gets only the text added since its last update, at most every PartialInterval
+        # seconds or when a sentence ends, so a long answer is not redrawn on every token.
+        Shown = 0
+        Last = 0.0
+        for Chunk in Chunks:
+            Parts.append(Chunk)
+            now = time.monotonic()
+            if now - Last >= PartialInterval or Chunk.rstrip().endswith((".", "!", "?")):
+                ShowPartial(Shown)
+                Shown, Last = len(Parts), now
+            yield Chunk
+        if Shown < len(Parts):
+            ShowPartial(Shown)
+
+    def ShowPartial(Shown):
+        Text = "".join(Parts[Shown:])
+        if Shown == 0:
+            ShowPartialTextToScreen(f"{Assistantname}: {Text}", first=True)
+        else:
+            ShowPartialTextToScreen(Text)
+
+    SetAssistantStatus("Answering...")
+    if SpeechSink is not None:
+        for _ in Record():
+            pass
+        SpeechSink(AnswerModifier("".join(Parts)))
+    else:
+        GetSpeechQueue().say_stream(SplitSentences(Record()))
+        if wait:
+            GetSpeechQueue().wait()
+    return AnswerModifier("".join(Parts))
+
+
+def CaptureQuery():
+    BeginTurn()
+    SetAssistantStatus("Listening...")
+
+    Query = SpeechRecognition()
+    print(f"[DEBUG] You said: {Query}")
+    ShowTextToScreen(f"{Username}: {Query}")
+    return Query
+
+
 def MainExecution():
+    return ExecuteTurn(CaptureQuery())
+
+
+def ExecuteTurn(Query):
+    """Execute one captured query, recording it for offline replay when RecordTurns is set."""
+    if recorder is None:
+        return ExecuteQuery(Query)
+    with recorder.turn(Query):
+        return ExecuteQuery(Query)
+
+
+def StartImageGeneration(ImageGenerationQuery):
+    from Backend.ImageGeneration import GetImageWorker
+    if GetImageWorker(MaxImageJobs).submit(ImageGenerationQuery):
+        SetAssistantStatus("Generating images...")
+
+
+def OnImageEvent(topic, value):
+    # Completion of a background image job is reported on the chat screen.
+    if topic == IMAGE and value.get("state") in ("done", "failed") and value.get("detail"):
+        ShowTextToScreen(f"{Assistantname}: {value['detail']}")
+
+
+bus.add_sink(OnImageEvent)
+
+
+def GeneralIntent(Decision):
+    return ChatBot(QueryModifier(Decision.replace("general", "", 1)))
+
+
+def RealtimeIntent(Decision):
+    return RealtimeSearchEngine(QueryModifier(Decision.replace("realtime", "", 1)))
+
+
+def ImageIntent(Decision):
+    import re
+    match = re.search(r"generate image(?: of)? (.+)", Decision, re.IGNORECASE)
+    if match:
+        StartImageGeneration(match.group(1).strip(" ."))
+
+
+def AlarmIntent(Decision):
+    alarm_time = Decision.lower().replace("alarm", "").replace("reminder", "").strip()
+    SetAlarm(alarm_time)
+    return f"Alarm set successfully for {alarm_time}"
+
+
+def AutomationIntent(Decision):
+    Result = run(Automation([Decision]))
+    return Result if isinstance(Result, str) else None
+
+
+# Decisions that need the user's attention (dialogs, microphone, exit) keep the sequential path.
+def IsSequentialDecision(Decision):
+    lowered = Decision.lower()
+    return (lowered.startswith(("exit", "email", "send_email"))
+            or "sign language" in lowered or "translate to sign" in lowered)
+
+
+# Bounded pool that runs the intents of a compound request side by side.
+dispatcher = Dispatcher([
+    ("general", GeneralIntent),
+    ("realtime", RealtimeIntent),
+    ("generate image", ImageIntent),
+    ("alarm", AlarmIntent),
+    ("reminder", AlarmIntent),
+    ("open", AutomationIntent),
+    ("close", AutomationIntent),
+    ("play", AutomationIntent),
+    ("system", AutomationIntent),
+    ("content", AutomationIntent),
+    ("google search", AutomationIntent),
+    ("youtube search", AutomationIntent),
+], max_workers=int(env_vars.get("MaxParallelIntents", 4)))
+
+
+# Decisions that can start the moment the model has produced them, before the rest of the reply.
+EarlyDecisions = ("open", "close", "play", "system", "google search", "youtube search")
+
+
+def DecideAndStart(Query, on_remote=None):
+    """Collect the decisions for a query, starting plain automations as soon as each one is parsed.
+
+    on_remote is called if the decision has to wait for Cohere. Returns the decision list and
+    {index: future} for the decisions already running.
+    """
+    Decision = []
+    Started = {}
+    Early = True
+    for Item in FirstLayerDMMStream(Query, on_remote=on_remote):
+        if IsSequentialDecision(Item):
+            Early = False  # Anything after a dialog or exit waits for the usual flow.
+        elif Early and Item.startswith(EarlyDecisions):
+            Future = dispatcher.submit(Item)
+            if Future is not None:
+                Started[len(Decision)] = Future
+        Decision.append(Item)
+    return Decision, Started
+
+
+def ExecuteDecisions(Decision, Started=None):
+    """Run every decision at once and present the answers in decision order."""
+    SetAssistantStatus("Thinking...")
+    Started = Started or {}
+    Futures = [(Item, Started[Index] if Index in Started else dispatcher.submit(Item)) for Index, Item in enumerate(Decision)]
+    Answers = [Result for _, Result in dispatcher.gather(Futures) if isinstance(Result, str) and Result.strip()]
+
+    if Answers:
+        Answer = "\n".join(Answers)
+        ShowTextToScreen(f"{Assistantname}: {Answer}")
+        SetAssistantStatus("Answering...")
+        Speak(Answer)
+    return True
+
+
+def ExecuteQuery(Query):
     TaskExecution = False
     ImageExecution = False
     ImageGenerationQuery = ""
@@ -130,17 +348,11 @@ def MainExecution():
     latest_content = ""
     Answer = ""
 
-    SetAssistantStatus("Listening...")
-
-    Query = SpeechRecognition()
-    print(f"[DEBUG] You said: {Query}")
-    ShowTextToScreen(f"{Username}: {Query}")
-
     # --- PRIORITY: Sign Language Translator ---
     if "sign language" in Query.lower() or "translate to sign" in Query.lower():
         try:
             print("\n[DIRECT] Starting sign language translation...")
-            TextToSpeech("Sign language starting now.")
+            Speak("Sign language starting now.", wait=True)
             
             # Import and run the translator directly
             import tkinter as tk
@@ -164,7 +376,7 @@ def MainExecution():
             
         except Exception as e:
             print(f"[SIGN ERROR] {str(e)}")
-            TextToSpeech("Sorry, couldn't start sign language.")
+            Speak("Sorry, couldn't start sign language.")
             return True
 
     # --- Feature: Create Folder or File by Voice Command ---
@@ -176,18 +388,34 @@ def MainExecution():
         folder_name = folder_match.group(1).strip().replace(" ", "_")
         success, message = create_folder(folder_name)
         ShowTextToScreen(f"{Assistantname}: {message}")
-        TextToSpeech(message)
+        Speak(message)
         return True
     elif file_match:
         file_name = file_match.group(1).strip().replace(" ", "_")
         success, message = create_file(file_name)
         ShowTextToScreen(f"{Assistantname}: {message}")
-        TextToSpeech(message)
+        Speak(message)
         return True
 
     SetAssistantStatus("Thinking...")
-    Decision = FirstLayerDMM(Query)
+    Speculation = None
+
+    def Speculate():
+        # Only worth it while Cohere decides; local shortcuts answer before a speculation could help.
+        nonlocal Speculation
+        Speculation = SpeculativeChat(QueryModifier(Query))
+
+    def DropSpeculation():
+        # Every return that does not use the speculative answer goes through here.
+        nonlocal Speculation
+        if Speculation is not None:
+            Speculation.cancel()
+            Speculation = None
+
+    Decision, Started = DecideAndStart(Query, on_remote=Speculate if SpeculativeAnswers else None)
     print("[DEBUG] Decision:", Decision)
+    if not (len(Decision) == 1 and Decision[0].startswith("general")):
+        DropSpeculation()
 
     content_keywords = ['story', 'letter', 'article', 'essay']
     is_content_task = any(any(kw in task.lower() for kw in content_keywords) for task in Decision)
@@ -205,12 +433,17 @@ def MainExecution():
             open_notepad_and_wait(input_txt_path, initial_content=ai_generated_content)
             convert_text_to_pdf(input_txt_path, output_pdf_path)
             open_pdf(output_pdf_path)
-            TextToSpeech(f"The content has been saved as a PDF at {output_pdf_path}")
+            Speak(f"The content has been saved as a PDF at {output_pdf_path}")
         except Exception as e:
             print(f"[ERROR] PDF generation failed: {e}")
-            TextToSpeech("Sorry, I faced an error while saving your PDF.")
+            DropSpeculation()
+            Speak("Sorry, I faced an error while saving your PDF.")
             return True
 
+    # Compound requests run all of their intents at once instead of stopping at the first answer.
+    if len(Decision) > 1 and not any(IsSequentialDecision(i) for i in Decision):
+        return ExecuteDecisions(Decision, Started)
+
     G = any([i for i in Decision if i.startswith("general")])
     R = any([i for i in Decision if i.startswith("realtime")])
     Mearged_query = " and ".join(
@@ -240,34 +473,29 @@ def MainExecution():
                         success = send_email_with_manual_input(body)
                         
                         if success:
-                            TextToSpeech("Email sent successfully.")
+                            Speak("Email sent successfully.")
                             ShowTextToScreen(f"{Assistantname}: Email sent successfully.")
                         else:
-                            TextToSpeech("Failed to send email. Please try again.")
+                            Speak("Failed to send email. Please try again.")
                             ShowTextToScreen(f"{Assistantname}: Failed to send email.")
                     except Exception as e:
                         logger.error(f"Email error: {e}", exc_info=True)
-                        TextToSpeech("Sorry, there was an error sending the email.")
+                        Speak("Sorry, there was an error sending the email.")
                         ShowTextToScreen(f"{Assistantname}: Error sending email.")
                 else:
-                    run(Automation(list(Decision)))
+                    Remaining = [Item for Index, Item in enumerate(Decision) if Index not in Started]
+                    if Remaining:
+                        Result = run(Automation(Remaining))
+                        if isinstance(Result, str):
+                            ShowTextToScreen(f"{Assistantname}: {Result}")
+                            Speak(Result)
                 TaskExecution = True
 
-    if ImageExecution:
-        with open(rf'Frontend\Files\ImageGeneration.data', "w") as file:
-            file.write(f"{ImageGenerationQuery}, True")
+    if Started:
+        dispatcher.gather([(Decision[Index], Future) for Index, Future in Started.items()])
 
-        try:
-            p1 = subprocess.Popen(
-                ['python', rf'Backend\ImageGeneration.py'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE,
-                shell=False
-            )
-            subprocesses.append(p1)
-        except Exception as e:
-            print(f"[ERROR] Starting ImageGeneration.py: {e}")
+    if ImageExecution:
+        StartImageGeneration(ImageGenerationQuery)
 
     for Queries in Decision:
         # Check for sign language command first - DIRECT EXECUTION
@@ -280,8 +508,9 @@ def MainExecution():
                 from Backend.SignLanguageTranslator import SignLanguageTranslator
                 
                 # Update status and notify user
+                DropSpeculation()
                 SetAssistantStatus("Sign Language Mode")
-                TextToSpeech("Sign language ready. Speak now.")
+                Speak("Sign language ready. Speak now.", wait=True)
                 
                 # Initialize and run translator
                 translator = SignLanguageTranslator()
@@ -303,26 +532,36 @@ def MainExecution():
                 
             except Exception as e:
                 print(f"[DIRECT SIGN ERROR] {str(e)}")
-                TextToSpeech("Sign language translation failed.")
+                Speak("Sign language translation failed.")
                 return True
 
         # Original command processing continues...
         elif "general" in Queries:
             SetAssistantStatus("Thinking...")
             QueryFinal = Queries.replace("general", "")
-            Answer = ChatBot(QueryModifier(QueryFinal))
+            if PipelinedTurns or StreamAnswers:
+                # The first sentence is spoken while the rest is still being generated.
+                Chunks = Speculation.stream() if Speculation is not None else ChatBotStream(QueryModifier(QueryFinal))
+                Answer = SpeakStream(Chunks, wait=not PipelinedTurns)
+                ShowTextToScreen(f"{Assistantname}: {Answer}")
+                return True
+            Answer = Speculation.commit() if Speculation is not None else ChatBot(QueryModifier(QueryFinal))
             ShowTextToScreen(f"{Assistantname}: {Answer}")
             SetAssistantStatus("Answering...")
-            TextToSpeech(Answer)
+            Speak(Answer)
             return True
 
         elif "realtime" in Queries:
             SetAssistantStatus("Searching...")
             QueryFinal = Queries.replace("realtime", "")
+            if PipelinedTurns or StreamAnswers:
+                Answer = SpeakStream(RealtimeSearchEngineStream(QueryModifier(QueryFinal)), wait=not PipelinedTurns)
+                ShowTextToScreen(f"{Assistantname}: {Answer}")
+                return True
             Answer = RealtimeSearchEngine(QueryModifier(QueryFinal))
             ShowTextToScreen(f"{Assistantname}: {Answer}")
             SetAssistantStatus("Answering...")
-            TextToSpeech(Answer)
+            Speak(Answer)
             return True
 
         elif "alarm" in Queries or "reminder" in Queries:
@@ -330,7 +569,7 @@ def MainExecution():
             print(f"[DEBUG] Alarm time extracted for SetAlarm: '{alarm_time}'")
             SetAlarm(alarm_time)
             ShowTextToScreen(f"Alarm set for {alarm_time}")
-            TextToSpeech(f"Alarm set successfully for {alarm_time}")
+            Speak(f"Alarm set successfully for {alarm_time}")
             return True
 
         elif "send email" in Query.lower():
@@ -350,14 +589,14 @@ def MainExecution():
                 if recipient:
                     success = send_email(recipient, subject, content)
                     if success:
-                        TextToSpeech(f"Email sent successfully to {recipient}")
+                        Speak(f"Email sent successfully to {recipient}")
                     else:
-                        TextToSpeech(f"Sorry, I could not find the email for {recipient}")
+                        Speak(f"Sorry, I could not find the email for {recipient}")
                 else:
-                    TextToSpeech("Please specify whom to send the email to.")
+                    Speak("Please specify whom to send the email to.")
             except Exception as e:
                 print(f"[ERROR] Email sending failed: {e}")
-                TextToSpeech("Sorry, I encountered an error sending the email.")
+                Speak("Sorry, I encountered an error sending the email.")
 
             return True
 
@@ -367,12 +606,39 @@ def MainExecution():
             Answer = ChatBot("Okay, Bye!")
             ShowTextToScreen(f"{Assistantname}: {Answer}")
             SetAssistantStatus("Answering...")
-            TextToSpeech(Answer)
+            Speak(Answer, wait=True)
+            if SpeechSink is not None:
+                return True  # Headless batches keep going after an "exit" query.
+            if TraceFile:
+                DumpTraces(TraceFile)  # os._exit skips atexit handlers.
+            from Backend.ChatLogStore import chat_log
+            chat_log.flush()  # The last exchange may still be waiting for the writer thread.
             os._exit(1)
 
 
 
+# Counts wakeups of the idle worker that did not find the microphone active.
+IdleWakeups = RateCounter()
+
+
+def IdleWakeupsPerMinute():
+    return IdleWakeups.per_minute()
+
+
+def WaitForMicrophone():
+    bus.wait_for(MIC, lambda status: status == "True", wakeups=IdleWakeups)
+
+
+def PipelineIdle(listening):
+    SetAssistantStatus("Listening..." if listening else "Available...")
+
+
 def FirstThread():
+    if PipelinedTurns:
+        # Capture the next utterance while the current answer is still being generated.
+        TurnPipeline(CaptureQuery, ExecuteTurn, WaitForMicrophone, speech=GetSpeechQueue(), on_idle=PipelineIdle).start()
+        return
+
     while True:
         CurrentStatus = GetMicrophoneStatus()
         if CurrentStatus == "True":
@@ -381,14 +647,90 @@ def FirstThread():
             AIStatus = GetAssistantStatus()
             if "Available..." not in AIStatus:
                 SetAssistantStatus("Available...")
-            sleep(0.1)
+            # Sleep until the GUI toggles the mic on; no polling while idle.
+            WaitForMicrophone()
+
+
+MemoryReportMinutes = float(env_vars.get("MemoryReportMinutes", 0))
+
+
+def MemoryReport():
+    """Log the conversation buffer sizes, idle wakeups and provider health periodically during long sessions."""
+    while True:
+        time.sleep(MemoryReportMinutes * 60)
+        print(f"[INFO] Conversation buffers: {json.dumps(BufferStats())}")
+        print(f"[INFO] Idle wakeups in the last minute: {IdleWakeupsPerMinute():.0f}")
+        if "Backend.Resilience" in sys.modules:
+            print(f"[INFO] Providers: {json.dumps(sys.modules['Backend.Resilience'].ResilienceStats())}")
+
+
+def WarmBackends():
+    """Load the heavy backends in the background so the first turn does not pay for them."""
+    # Lazy proxies: the imports behind them (selenium, httpx, ...) happen on the warmup thread,
+    # not on the GUI thread that calls this.
+    Warmup(
+        Lazy("Backend.Providers", "WarmConnections"),
+        "Backend.Model",
+        "Backend.Chatbot",
+        "Backend.RealtimeSearchEngine",
+        "Backend.TextToSpeech",
+        Lazy("Backend.SpeechToText", "GetDriver"),
+        "Backend.Automation",
+        "Backend.Alarm",
+        "Backend.PDFGenerator",
+        "Backend.EmailHandler",
+    )
+
+
+def OnWindowShown():
+    import_timer.stop()
+    if StartupReport:
+        import_timer.report(StartupBudget)
+    elif import_timer.elapsed() > StartupBudget:
+        print(f"[WARNING] Cold start took {import_timer.elapsed():.2f}s, over the {StartupBudget:.2f}s budget. Run with --startup-report for details.")
+    WarmBackends()
 
 
 def SecondThread():
-    GraphicalUserInterface()
+    from Frontend.GUI import GraphicalUserInterface
+    GraphicalUserInterface(on_shown=OnWindowShown)
+
+
+def Headless(args):
+    """Text-only mode: no Chrome, microphone, speakers or Qt window."""
+    global SpeechSink, PipelinedTurns
+    from Backend.Headless import RunHeadless, Headless as HeadlessRunner
+    PipelinedTurns = False  # Answers are collected whole, never streamed to the speech queue.
+    runner = HeadlessRunner(ExecuteTurn, args.workers)
+    SpeechSink = runner.sink
+    # Only JSON lines go to stdout; every other print, including late ones from the warmup
+    # thread, goes to stderr for the rest of the process.
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    ShowDefaultChatIfNoChats()
+    from Backend.Providers import WarmConnections
+    Warmup(WarmConnections)
+    RunHeadless(runner, args.input, args.output, args.socket, stdout)
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description=f"{Assistantname} assistant")
+    parser.add_argument("--startup-report", action="store_true", help="print the slowest imports once the window is shown")
+    parser.add_argument("--headless", action="store_true", help="read text queries instead of listening and print answers as JSON lines")
+    parser.add_argument("--input", help="headless: file with one query per line (default: stdin)")
+    parser.add_argument("--output", help="headless: file for the JSON line results (default: stdout)")
+    parser.add_argument("--socket", metavar="HOST:PORT", help="headless: accept queries on a local TCP socket instead")
+    parser.add_argument("--workers", type=int, default=1, help="headless: queries executed concurrently")
+    args = parser.parse_args()
+
+    if RecordTurns:
+        from Backend.Replay import StartRecording
+        recorder = StartRecording(RecordTurns)
+    if MemoryReportMinutes > 0:
+        threading.Thread(target=MemoryReport, daemon=True).start()
+    if args.headless:
+        Headless(args)
+        sys.exit(0)
     InitialExecution()
     thread2 = threading.Thread(target=FirstThread, daemon=True)
     thread2.start()
@@ -0,0 +1,33 @@
+from Backend.AnswerCache import AnswerCache
+
+
+def test_rephrased_question_reuses_answer():
+    cache = AnswerCache()
+    cache.put("what is python", "A programming language.")
+    assert cache.get("What's Python?") == "A programming language."
+    assert cache.get("tell me what is python please") == "A programming language."
+    assert cache.get("what's python programming language?") == "A programming language."
+
+
+def test_generic_words_alone_do_not_match():
+    cache = AnswerCache()
+    cache.put("what is programming", "Writing instructions for computers.")
+    assert cache.get("what is a language") is None
+
+
+def test_near_miss_questions_are_not_answered_from_cache():
+    cache = AnswerCache()
+    cache.put("what is the capital of india", "New Delhi")
+    cache.put("who wrote hamlet", "William Shakespeare")
+    cache.put("when was einstein born", "1879")
+    assert cache.get("what is the capital of indiana") is None
+    assert cache.get("who wrote macbeth") is None
+    assert cache.get("where was einstein born") is None
+
+
+def test_questions_with_numbers_bypass_the_cache():
+    cache = AnswerCache()
+    cache.put("what is the square root of 144", "12")
+    assert cache.get("what is the square root of 144") is None
+    assert cache.get("what is the square root of 169") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,29 @@
+from Backend.ConversationBuffer import ConversationBuffer, EstimateTokens
+
+
+def user(text):
+    return {"role": "user", "content": text}
+
+
+def test_every_mutation_keeps_the_token_count():
+    buffer = ConversationBuffer("test.tokens", max_messages=10, max_tokens=10_000)
+    buffer.append(user("a" * 40))
+    buffer += [user("b" * 80)]
+    buffer.insert(0, user("c" * 120))
+    buffer[1] = user("d" * 400)
+    buffer.pop()
+    buffer.remove(buffer[0])
+    del buffer[0:0]
+    assert buffer == [user("d" * 400)]
+    assert buffer.tokens == sum(EstimateTokens(message["content"]) for message in buffer)
+
+
+def test_every_mutation_keeps_the_budget():
+    buffer = ConversationBuffer("test.budget", max_messages=3, max_tokens=10_000)
+    buffer += [user(str(i)) for i in range(5)]
+    assert buffer == [user("2"), user("3"), user("4")]
+    buffer.insert(1, user("x"))
+    assert len(buffer) == 3
+    buffer *= 2
+    assert len(buffer) == 3
+    assert buffer.stats()["peak_messages"] == 3
@@ -0,0 +1,20 @@
+from Backend.Model import detect_fast_path
+
+
+def test_farewells_exit():
+    assert detect_fast_path("bye") == ["exit"]
+    assert detect_fast_path("okay goodbye.") == ["exit"]
+    assert detect_fast_path("quit") == ["exit"]
+
+
+def test_quit_or_exit_with_an_app_closes_it():
+    assert detect_fast_path("quit chrome") == ["close chrome"]
+    assert detect_fast_path("quit spotify") == ["close spotify"]
+    assert detect_fast_path("exit fullscreen") == ["close fullscreen"]
+
+
+def test_ambiguous_commands_go_to_the_model():
+    assert detect_fast_path("start a timer for five minutes") is None
+    assert detect_fast_path("launch the missiles") is None
+    assert detect_fast_path("google maps") is None
+    assert detect_fast_path("google search cats") == ["google search cats"]